@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Cold-start time-to-first-byte measurement.
+Usage (from the api directory): python -m benchmarks.cold_start [--runs N] [--path /api/datasets/]
+
+Starts a fresh uvicorn process per run against the configured database and times
+process start -> listening, and the first and second responses for a list page,
+with and without connection pool warm-up and cache pre-population.
+"""
+
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+SCENARIOS = [
+    ("cold", {"DB_POOL_WARMUP": "0", "CACHE_PREWARM_PATHS": ""}),
+    ("pool warm-up", {"DB_POOL_WARMUP": "4", "DB_POOL_SIZE": "4", "CACHE_PREWARM_PATHS": ""}),
+    ("pool + cache warm-up", {"DB_POOL_WARMUP": "4", "DB_POOL_SIZE": "4", "CACHE_PREWARM_PATHS": "{path}"}),
+]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=60):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return True
+        except OSError:
+            time.sleep(0.005)
+    return False
+
+
+def time_to_first_byte(port, path):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    start = time.perf_counter()
+    connection.request("GET", path, headers={"Accept-Encoding": "gzip"})
+    response = connection.getresponse()
+    ttfb = time.perf_counter() - start
+    response.read()
+    connection.close()
+    return ttfb, response.status
+
+
+def run_once(env_overrides, path):
+    port = free_port()
+    env = dict(os.environ, **env_overrides)
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        if not wait_for_port(port):
+            raise RuntimeError("server did not start")
+        listening = time.perf_counter() - start
+        first, status = time_to_first_byte(port, path)
+        second, _ = time_to_first_byte(port, path)
+        return listening, first, second, listening + first, status
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start TTFB benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/api/datasets/")
+    args = parser.parse_args()
+
+    print("📊 Cold-start time-to-first-byte (median of runs, ms)")
+    print("=" * 78)
+    print(f"{'scenario':<24}{'listening':>12}{'1st TTFB':>12}{'2nd TTFB':>12}{'spawn→byte':>14}")
+
+    for name, overrides in SCENARIOS:
+        overrides = {key: value.format(path=args.path) for key, value in overrides.items()}
+        results = [run_once(overrides, args.path) for _ in range(args.runs)]
+        if any(result[4] != 200 for result in results):
+            print(f"{name:<24}  non-200 responses, check the database configuration")
+            continue
+        medians = [statistics.median(result[i] for result in results) * 1000 for i in range(4)]
+        print(f"{name:<24}{medians[0]:>12.1f}{medians[1]:>12.1f}{medians[2]:>12.1f}{medians[3]:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Benchmark of compression CPU cost against bytes saved.
+Usage (from the api directory): python -m benchmarks.compression [--from-app] [--rounds N]
+
+By default typical list (100 cards) and detail (preview with sample data) payloads
+are synthesised. With --from-app the payloads are fetched through the API from the
+configured database instead.
+"""
+
+import argparse
+import json
+import random
+import time
+
+from middleware.compression import build_compressors
+
+
+def synthetic_list_payload(count=100):
+    random.seed(1)
+    datasets = []
+    for i in range(count):
+        datasets.append(
+            {
+                "id": f"DS{i:05d}",
+                "name": f"Customer transactions {i} ({random.choice(['daily', 'monthly', 'snapshot'])})",
+                "description": "Consolidated view of customer transactions across channels, "
+                "including card, transfer and direct debit movements. " * 2,
+                "businessLine": random.choice(["Retail Banking", "Wholesale Banking", "Risk"]),
+                "dataDomain": random.choice(["Customer", "Finance", "Payments"]),
+                "maturity": random.choice(["Gold", "Silver", "Bronze"]),
+                "updatedAt": f"2025-07-{random.randint(1, 27):02d}T10:{random.randint(0, 59):02d}:00",
+                "sourceSysId": f"SYS{random.randint(100, 999)}",
+                "sourceSysName": random.choice(["Core Banking", "CRM", "Data Lake"]),
+                "metrics": {
+                    "qualityScore": random.randint(50, 100),
+                    "averageRating": round(random.uniform(1, 5), 2),
+                    "usageCount": random.randint(0, 5000),
+                    "completeness": 0,
+                    "accuracy": 0,
+                    "timeliness": 0,
+                },
+                "dataOwner": {"id": "", "name": f"Expert {random.randint(1, 40)}", "email": "", "department": ""},
+                "dataClassification": "Internal",
+                "tags": [],
+                "numberOfDataElements": 0,
+            }
+        )
+    payload = {"datasets": datasets, "pagination": {"page": 1, "limit": count, "total": 2009, "pages": 21}}
+    return json.dumps(payload).encode()
+
+
+def synthetic_detail_payload(columns=15, rows=50):
+    random.seed(2)
+    column_names = [f"column_{c}" for c in range(columns)]
+    detail = json.loads(synthetic_list_payload(1))["datasets"][0]
+    detail["ratings"] = [
+        {"id": r, "userId": f"U{r}", "userName": f"User {r}", "rating": random.randint(1, 5),
+         "comment": "Useful dataset, well documented.", "createdAt": "2025-07-01T10:00:00"}
+        for r in range(10)
+    ]
+    detail["preview"] = {
+        "columns": [{"name": name, "type": random.choice(["string", "integer", "date"])} for name in column_names],
+        "sampleData": [
+            {name: random.choice([f"value {random.randint(0, 10_000)}", random.randint(0, 10**6), "2025-07-01"]) for name in column_names}
+            for _ in range(rows)
+        ],
+        "rowCount": 125_000,
+    }
+    return json.dumps(detail).encode()
+
+
+def app_payloads():
+    """Fetch a 100-card list page and one detail payload through the API"""
+    from fastapi.testclient import TestClient
+    from main import app
+
+    with TestClient(app) as client:
+        listing = client.get("/api/datasets/?limit=100", headers={"Accept-Encoding": "identity"})
+        first_id = listing.json()["datasets"][0]["id"]
+        detail = client.get(f"/api/datasets/{first_id}", headers={"Accept-Encoding": "identity"})
+        return listing.content, detail.content
+
+
+def bench(name, body, rounds):
+    print(f"\n{name}: {len(body):,} bytes")
+    print(f"{'encoding':<10}{'level':>6}{'bytes':>10}{'ratio':>8}{'saved':>10}{'µs/op':>10}{'MB/s':>9}")
+
+    settings = [
+        ("gzip", {"gzip_level": 1}, 1),
+        ("gzip", {"gzip_level": 6}, 6),
+        ("gzip", {"gzip_level": 9}, 9),
+        ("br", {"brotli_quality": 1}, 1),
+        ("br", {"brotli_quality": 4}, 4),
+        ("br", {"brotli_quality": 11}, 11),
+        ("zstd", {"zstd_level": 1}, 1),
+        ("zstd", {"zstd_level": 3}, 3),
+        ("zstd", {"zstd_level": 19}, 19),
+    ]
+    for encoding, kwargs, level in settings:
+        compressors = build_compressors(**kwargs)
+        if encoding not in compressors:
+            print(f"{encoding:<10}{level:>6}  (not installed)")
+            continue
+        compress = compressors[encoding]
+        compressed = compress(body)
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            compress(body)
+        elapsed = (time.perf_counter() - start) / rounds
+
+        print(
+            f"{encoding:<10}{level:>6}{len(compressed):>10,}{len(body) / len(compressed):>8.1f}"
+            f"{len(body) - len(compressed):>10,}{elapsed * 1e6:>10.0f}{len(body) / elapsed / 1e6:>9.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compression cost benchmark")
+    parser.add_argument("--from-app", action="store_true", help="use real payloads from the configured database")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.from_app:
+        list_body, detail_body = app_payloads()
+    else:
+        list_body, detail_body = synthetic_list_payload(), synthetic_detail_payload()
+
+    print("📊 Compression benchmark (cache hits reuse the stored bytes and skip this cost)")
+    print("=" * 63)
+    bench("List page (100 datasets)", list_body, args.rounds)
+    bench("Dataset detail with preview", detail_body, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the related-dataset graph endpoint.
+Usage (from the api directory): python -m benchmarks.related_graph [--nodes N] [--degree D] [--depth 3] [--sql]
+
+Builds a synthetic related_datasets graph (100k datasets x 10 relations = 1M edges by
+default), then times the in-memory adjacency index build and neighbourhood walks.
+With --sql the same graph is copied into a scratch schema of the configured database
+and the recursive CTE is timed on the same roots.
+"""
+
+import argparse
+import io
+import random
+import statistics
+import time
+
+from dotenv import load_dotenv
+
+from database.related_graph import AdjacencyGraph, sql_neighborhood
+
+RELATIONSHIP_TYPES = ["similar", "derived_from", "same_domain", "complementary"]
+BENCH_SCHEMA = "related_graph_bench"
+
+
+def synthetic_edges(nodes, degree, seed=7):
+    """Rows shaped like EDGES_QUERY output, sorted by (source, target)"""
+    rng = random.Random(seed)
+    ids = [f"DS{i:07d}" for i in range(nodes)]
+    rows = []
+    for source in range(nodes):
+        targets = sorted(set(rng.randrange(nodes) for _ in range(degree)) - {source})
+        for target in targets:
+            rows.append((ids[source], ids[target], rng.choice(RELATIONSHIP_TYPES), round(rng.random(), 3)))
+    return ids, rows
+
+
+def time_walks(walk, roots):
+    timings = []
+    sizes = []
+    for root in roots:
+        start = time.perf_counter()
+        nodes, edges, _ = walk(root)
+        timings.append((time.perf_counter() - start) * 1000)
+        sizes.append((len(nodes), len(edges)))
+    return timings, sizes
+
+
+def summary(timings):
+    timings = sorted(timings)
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return f"p50 {statistics.median(timings):8.2f} ms   p95 {p95:8.2f} ms"
+
+
+def load_into_database(rows):
+    """Copy the synthetic graph into a scratch schema and return an engine bound to it"""
+    from database.connection import get_engine
+
+    engine = get_engine()
+    with engine.begin() as connection:
+        connection.exec_driver_sql(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+        connection.exec_driver_sql(f"CREATE SCHEMA {BENCH_SCHEMA}")
+        connection.exec_driver_sql(
+            f"CREATE TABLE {BENCH_SCHEMA}.related_datasets ("
+            "dataset_id VARCHAR(50), related_dataset_id VARCHAR(50), "
+            "relationship_type VARCHAR(50), similarity_score NUMERIC(4,3))"
+        )
+        buffer = io.StringIO("".join(f"{s}\t{t}\t{r}\t{score}\n" for s, t, r, score in rows))
+        cursor = connection.connection.cursor()
+        cursor.copy_expert(f"COPY {BENCH_SCHEMA}.related_datasets FROM STDIN", buffer)
+        connection.exec_driver_sql(
+            f"CREATE INDEX ON {BENCH_SCHEMA}.related_datasets (dataset_id, related_dataset_id)"
+        )
+        connection.exec_driver_sql(f"ANALYZE {BENCH_SCHEMA}.related_datasets")
+    return engine
+
+
+def main():
+    # The engine reads its settings from the environment, as when the app runs
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Related-dataset graph benchmark")
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--degree", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--min-score", type=float, default=None)
+    parser.add_argument("--max-nodes", type=int, default=5000)
+    parser.add_argument("--roots", type=int, default=200)
+    parser.add_argument("--sql", action="store_true", help="also time the recursive CTE against the database")
+    args = parser.parse_args()
+
+    print("📊 Related dataset graph benchmark")
+    print("=" * 60)
+
+    ids, rows = synthetic_edges(args.nodes, args.degree)
+    roots = random.Random(11).sample(ids, min(args.roots, len(ids)))
+    print(f"Graph: {len(ids):,} datasets, {len(rows):,} edges, depth {args.depth}, max {args.max_nodes} nodes")
+
+    start = time.perf_counter()
+    graph = AdjacencyGraph(rows)
+    print(f"Adjacency index build: {(time.perf_counter() - start) * 1000:,.0f} ms")
+
+    timings, sizes = time_walks(
+        lambda root: graph.neighborhood(root, args.depth, args.min_score, args.max_nodes), roots
+    )
+    nodes = statistics.median(size[0] for size in sizes)
+    edges = statistics.median(size[1] for size in sizes)
+    print(f"In-memory BFS    {summary(timings)}   ({nodes:.0f} nodes, {edges:.0f} edges per walk)")
+
+    if args.sql:
+        engine = load_into_database(rows)
+        try:
+            with engine.connect() as connection:
+                connection.exec_driver_sql(f"SET search_path TO {BENCH_SCHEMA}, public")
+                sql_roots = roots[: max(1, len(roots) // 4)]
+                timings, sql_sizes = time_walks(
+                    lambda root: sql_neighborhood(connection, root, args.depth, args.min_score, args.max_nodes),
+                    sql_roots,
+                )
+                print(f"Recursive CTE    {summary(timings)}   ({len(sql_roots)} roots)")
+                if sql_sizes != sizes[: len(sql_roots)]:
+                    print("❌ CTE and in-memory walks returned different neighbourhoods")
+        finally:
+            with engine.begin() as connection:
+                connection.exec_driver_sql(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+
+
+if __name__ == "__main__":
+    main()
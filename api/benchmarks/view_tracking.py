@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Benchmark for write-behind view tracking.
+Usage (from the api directory): python -m benchmarks.view_tracking [--views N] [--datasets N] [--flush]
+                                [--server] [--workers N] [--duration S]
+
+Measures the raw ViewCounter.record() rate, the POST /api/datasets/{id}/views
+endpoint rate through the ASGI app, and optionally the time to flush a batch
+into the configured database.
+
+The in-process ASGI figure is bound by the httpx client running in the same process,
+so it understates the endpoint. --server starts serve.py against the configured
+database and drives it over keep-alive HTTP from separate load generator processes,
+which is the number to compare with the expected view traffic. The load generator
+needs cores of its own; on a machine with few CPUs it competes with the workers.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import httpx
+from dotenv import load_dotenv
+
+from database.view_counter import ViewCounter
+
+
+def bench_record(views, dataset_ids, threads):
+    """Record views from several threads straight into a counter"""
+    counter = ViewCounter(flush_interval=3600, flush_threshold=len(dataset_ids) + 1)
+    per_thread = views // threads
+
+    def worker():
+        for i in range(per_thread):
+            counter.record(dataset_ids[i % len(dataset_ids)])
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+
+    assert counter.pending() == per_thread * threads
+    return per_thread * threads / elapsed
+
+
+async def bench_endpoint(views, dataset_ids, concurrency):
+    """Post views through the full FastAPI stack (no network, no lifespan)"""
+    from main import app
+    from database.view_counter import view_counter
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        per_task = views // concurrency
+
+        async def worker():
+            for i in range(per_task):
+                dataset_id = dataset_ids[random.randrange(len(dataset_ids))]
+                response = await client.post(f"/api/datasets/{dataset_id}/views")
+                assert response.status_code == 202
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    total = per_task * concurrency
+    assert view_counter.pending() >= total
+    return total / elapsed
+
+
+def bench_server(dataset_ids, args):
+    """Post views to a serve.py process over HTTP, returns (views/s, errors, p50 ms, p99 ms)"""
+    from benchmarks.cold_start import free_port, wait_for_port
+    from benchmarks.worker_scaling import drive
+
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "serve.py", "--workers", str(args.workers), "--host", "127.0.0.1", "--port", str(port)],
+        env=dict(os.environ, WEB_CONCURRENCY=str(args.workers)),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    paths = [f"/api/datasets/{dataset_id}/views" for dataset_id in dataset_ids]
+    try:
+        if not wait_for_port(port):
+            raise RuntimeError("server did not start")
+        # Let every worker finish its startup before measuring
+        drive(port, paths, args.clients, args.client_threads, 1.0, method="POST")
+        ok, errors, latencies = drive(port, paths, args.clients, args.client_threads, args.duration, method="POST")
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+
+    p50 = statistics.median(latencies) * 1000 if latencies else 0
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000 if latencies else 0
+    return ok / args.duration, errors, p50, p99
+
+
+def bench_flush(dataset_ids):
+    """Flush one view per dataset into the configured database"""
+    from database.connection import get_engine
+
+    counter = ViewCounter()
+    counter.start(get_engine())
+    for dataset_id in dataset_ids:
+        counter.record(dataset_id)
+
+    start = time.perf_counter()
+    counter.stop()
+    return time.perf_counter() - start
+
+
+def main():
+    # The engine reads its settings from the environment, as when the app runs
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="View tracking benchmark")
+    parser.add_argument("--views", type=int, default=200_000)
+    parser.add_argument("--datasets", type=int, default=2_000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--flush", action="store_true", help="also time a batched flush against the database")
+    parser.add_argument("--server", action="store_true", help="also drive a serve.py process over HTTP")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=4, help="load generator processes")
+    parser.add_argument("--client-threads", type=int, default=16, help="keep-alive connections per client process")
+    args = parser.parse_args()
+
+    dataset_ids = [f"DS{i:05d}" for i in range(args.datasets)]
+
+    print("📊 View tracking benchmark")
+    print("=" * 45)
+
+    rate = bench_record(args.views, dataset_ids, args.threads)
+    print(f"ViewCounter.record ({args.threads} threads): {rate:,.0f} views/s")
+
+    endpoint_views = max(args.views // 10, args.concurrency)
+    rate = asyncio.run(bench_endpoint(endpoint_views, dataset_ids, args.concurrency))
+    print(f"POST /views (in-process ASGI, {args.concurrency} concurrent): {rate:,.0f} views/s")
+
+    if args.server:
+        rate, errors, p50, p99 = bench_server(dataset_ids, args)
+        connections = args.clients * args.client_threads
+        print(
+            f"POST /views (serve.py, {args.workers} worker(s), {connections} connections): {rate:,.0f} views/s, "
+            f"{errors} errors, p50 {p50:.1f} ms, p99 {p99:.1f} ms"
+        )
+
+    if args.flush:
+        elapsed = bench_flush(dataset_ids)
+        print(f"Flush of {len(dataset_ids)} datasets in one UPDATE: {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
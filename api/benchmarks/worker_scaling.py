@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Throughput scaling of the production launcher from 1 to N workers.
+Usage (from the api directory): python -m benchmarks.worker_scaling [--max-workers N] [--duration S] [--path /api/datasets/]
+
+Starts serve.py with 1, 2, 4, ... workers against the configured database (response
+cache disabled so every request reaches the routes), drives it with keep-alive clients
+from several processes and reports requests/s, latency percentiles and how long the
+graceful shutdown took.
+"""
+
+import argparse
+import http.client
+import multiprocessing
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from benchmarks.cold_start import free_port, wait_for_port
+
+
+def client_process(port, paths, threads, duration, results, method="GET"):
+    """
+    Run `threads` keep-alive clients for `duration` seconds, each cycling through `paths`
+    from its own offset, and report (ok, errors, latencies)
+    """
+    deadline = time.perf_counter() + duration
+    latencies = []
+    counts = {"ok": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def worker(offset):
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local = []
+        ok = errors = 0
+        sent = offset
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            path = paths[sent % len(paths)]
+            sent += 1
+            try:
+                connection.request(method, path)
+                response = connection.getresponse()
+                response.read()
+                if 200 <= response.status < 300:
+                    ok += 1
+                else:
+                    errors += 1
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                connection.close()
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            local.append(time.perf_counter() - start)
+        connection.close()
+        with lock:
+            latencies.extend(local)
+            counts["ok"] += ok
+            counts["errors"] += errors
+
+    workers = [threading.Thread(target=worker, args=(i * 7919,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    results.put((counts["ok"], counts["errors"], latencies))
+
+
+def drive(port, paths, clients, threads, duration, method="GET"):
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=client_process, args=(port, paths, threads, duration, results, method))
+        for _ in range(clients)
+    ]
+    for p in processes:
+        p.start()
+    collected = [results.get() for _ in processes]
+    for p in processes:
+        p.join()
+
+    ok = sum(c[0] for c in collected)
+    errors = sum(c[1] for c in collected)
+    latencies = sorted(latency for c in collected for latency in c[2])
+    return ok, errors, latencies
+
+
+def run(workers, args):
+    port = free_port()
+    env = dict(
+        os.environ,
+        RESPONSE_CACHE_TTL="0",
+        RESPONSE_CACHE_STALE_TTL="0",
+        WEB_CONCURRENCY=str(workers),
+    )
+    server = subprocess.Popen(
+        [sys.executable, "serve.py", "--workers", str(workers), "--host", "127.0.0.1", "--port", str(port)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        if not wait_for_port(port):
+            raise RuntimeError("server did not start")
+        # Let every worker finish its startup before measuring
+        drive(port, [args.path], args.clients, args.threads, 1.0)
+        ok, errors, latencies = drive(port, [args.path], args.clients, args.threads, args.duration)
+    finally:
+        start = time.perf_counter()
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+        shutdown = time.perf_counter() - start
+
+    p50 = statistics.median(latencies) * 1000 if latencies else 0
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000 if latencies else 0
+    return ok / args.duration, errors, p50, p99, shutdown
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker scaling benchmark")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--clients", type=int, default=4, help="load generator processes")
+    parser.add_argument("--threads", type=int, default=16, help="keep-alive connections per client process")
+    parser.add_argument("--path", default="/api/datasets/")
+    args = parser.parse_args()
+
+    counts = []
+    workers = 1
+    while workers < args.max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(args.max_workers)
+
+    print(f"📊 Worker scaling, GET {args.path}, {args.clients * args.threads} connections, {args.duration:.0f}s per run")
+    print("=" * 72)
+    print(f"{'workers':>8}{'req/s':>12}{'speedup':>10}{'errors':>9}{'p50 ms':>10}{'p99 ms':>10}{'stop s':>10}")
+
+    baseline = None
+    for workers in counts:
+        rate, errors, p50, p99, shutdown = run(workers, args)
+        baseline = baseline or rate
+        speedup = rate / baseline if baseline else 0
+        print(f"{workers:>8}{rate:>12,.0f}{speedup:>9.2f}x{errors:>9}{p50:>10.1f}{p99:>10.1f}{shutdown:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
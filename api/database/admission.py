@@ -0,0 +1,192 @@
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from fastapi import HTTPException
+from sqlalchemy import exc, text
+
+# Postgres SQLSTATE for a statement cancelled by statement_timeout
+QUERY_CANCELED = "57014"
+
+# Every admission error names its code in this header; the circuit breaker only counts
+# the codes that mean the database itself is failing, not local overload
+ERROR_CODE_HEADER = "X-Error-Code"
+DATABASE_FAILURE_CODES = ("pool_timeout", "statement_timeout", "database_unavailable")
+
+# Per-route defaults, each can be overridden with <ROUTE>_STATEMENT_TIMEOUT_MS,
+# <ROUTE>_MAX_CONCURRENCY, <ROUTE>_MAX_QUEUE and <ROUTE>_QUEUE_TIMEOUT (route name
+# upper-cased, dots as underscores)
+ROUTE_DEFAULTS = {
+    "datasets.list": {"statement_timeout_ms": 5000},
+    "datasets.detail": {"statement_timeout_ms": 3000},
+    "datasets.rankings": {"statement_timeout_ms": 1000},
+    "datasets.graph": {"statement_timeout_ms": 3000},
+    "organizations.datasets": {"statement_timeout_ms": 3000},
+    "users.favorites": {"statement_timeout_ms": 3000},
+}
+
+
+def _setting(route_name, key, default):
+    env_name = f"{route_name.upper().replace('.', '_')}_{key.upper()}"
+    value = os.getenv(env_name)
+    if value is None:
+        value = ROUTE_DEFAULTS.get(route_name, {}).get(key, default)
+    return type(default)(value)
+
+
+class Overloaded(Exception):
+    """Raised when a route's admission queue is full or the wait for a slot timed out"""
+
+
+class RouteLimiter:
+    """
+    Caps in-flight database work for one route. Every route draws from the same
+    `shared` slots, sized to the connection pool, so the routes together never run
+    more queries than there are connections; a route can be capped further with
+    max_concurrency. Callers without a slot wait, but only up to max_queue of them
+    and only for queue_timeout seconds; everyone else is rejected immediately so
+    latency stays bounded under overload.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        shared: threading.BoundedSemaphore,
+        max_queue: int,
+        queue_timeout: float,
+        max_concurrency: Optional[int] = None,
+    ):
+        self.name = name
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._shared = shared
+        self._own = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self.rejected = 0
+
+    def _acquire_all(self, timeout: Optional[float]):
+        """Take the route slot (if capped) and then a shared slot, releasing on failure"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if self._own is not None:
+            if not self._own.acquire(blocking=timeout is not None, timeout=timeout):
+                return False
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if self._shared.acquire(blocking=remaining is not None, timeout=remaining):
+            return True
+        if self._own is not None:
+            self._own.release()
+        return False
+
+    def _release_all(self):
+        self._shared.release()
+        if self._own is not None:
+            self._own.release()
+
+    @contextmanager
+    def slot(self):
+        if not self._acquire_all(None):
+            with self._lock:
+                if self._waiting >= self.max_queue:
+                    self.rejected += 1
+                    raise Overloaded(f"{self.name}: admission queue full")
+                self._waiting += 1
+            try:
+                acquired = self._acquire_all(self.queue_timeout)
+            finally:
+                with self._lock:
+                    self._waiting -= 1
+            if not acquired:
+                with self._lock:
+                    self.rejected += 1
+                raise Overloaded(f"{self.name}: timed out waiting for a slot")
+
+        try:
+            yield
+        finally:
+            self._release_all()
+
+
+# Slots shared by every route, created with the first limiter
+_shared_slots: Optional[threading.BoundedSemaphore] = None
+# One limiter per route name, shared by every endpoint registered under it
+_limiters = {}
+
+
+def _pool_capacity():
+    return int(os.getenv("DB_POOL_SIZE", 1)) + int(os.getenv("DB_MAX_OVERFLOW", 0))
+
+
+def get_limiter(route_name: str) -> RouteLimiter:
+    global _shared_slots
+
+    limiter = _limiters.get(route_name)
+    if limiter is None:
+        pool_capacity = _pool_capacity()
+        if _shared_slots is None:
+            # More concurrent queries than pooled connections would only queue inside the pool
+            total = min(int(os.getenv("ADMISSION_MAX_CONCURRENCY", pool_capacity)), pool_capacity)
+            _shared_slots = threading.BoundedSemaphore(max(1, total))
+        route_cap = _setting(route_name, "max_concurrency", 0)
+        limiter = RouteLimiter(
+            route_name,
+            _shared_slots,
+            max_queue=_setting(route_name, "max_queue", int(os.getenv("ADMISSION_MAX_QUEUE", 16))),
+            queue_timeout=_setting(route_name, "queue_timeout", float(os.getenv("ADMISSION_QUEUE_TIMEOUT", 2))),
+            max_concurrency=route_cap if 0 < route_cap < pool_capacity else None,
+        )
+        _limiters[route_name] = limiter
+    return limiter
+
+
+def _error(status_code, code, message, retry_after=None):
+    headers = {ERROR_CODE_HEADER: code}
+    if retry_after is not None:
+        headers["Retry-After"] = str(retry_after)
+    return HTTPException(status_code=status_code, detail={"code": code, "message": message}, headers=headers)
+
+
+def apply_statement_timeout(db, timeout_ms: int):
+    """Limit every statement in the session's current transaction to timeout_ms"""
+    if timeout_ms > 0:
+        db.execute(text("SELECT set_config('statement_timeout', :timeout, true)"), {"timeout": f"{timeout_ms}ms"})
+
+
+def admission_controlled(route_name: str):
+    """
+    Run a synchronous route under its RouteLimiter with a per-route statement_timeout.
+    Overload and database failures are mapped to distinct error codes:
+    overloaded / pool_timeout / database_unavailable (503 with Retry-After),
+    statement_timeout (504) and database_error (500).
+    """
+    limiter = get_limiter(route_name)
+    timeout_ms = _setting(route_name, "statement_timeout_ms", int(os.getenv("STATEMENT_TIMEOUT_MS", 0)))
+    retry_after = int(os.getenv("ADMISSION_RETRY_AFTER", 1))
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                with limiter.slot():
+                    db = kwargs.get("db")
+                    if db is not None:
+                        apply_statement_timeout(db, timeout_ms)
+                    return func(*args, **kwargs)
+            except Overloaded as e:
+                raise _error(503, "overloaded", str(e), retry_after)
+            except exc.TimeoutError as e:
+                raise _error(503, "pool_timeout", f"No database connection available: {e}", retry_after)
+            except exc.DBAPIError as e:
+                if getattr(e.orig, "pgcode", None) == QUERY_CANCELED:
+                    raise _error(504, "statement_timeout", f"{route_name} exceeded {timeout_ms} ms")
+                if isinstance(e, exc.OperationalError) or e.connection_invalidated:
+                    raise _error(503, "database_unavailable", f"Database unavailable: {e.orig}", retry_after)
+                raise _error(500, "database_error", f"Database error: {e.orig}")
+
+        wrapper.limiter = limiter
+        return wrapper
+
+    return decorator
@@ -0,0 +1,51 @@
+from sqlalchemy import text
+
+# Junction tables behind the organization and favorites dataset listings. Both are keyed
+# so that "datasets of X" is a primary key range scan, and the dataset_id indexes serve
+# the reverse lookups and the per-page favorites check. The (updated_at, id) index on
+# datasets they paginate by is created by migrate_to_supabase.py --create-indexes.
+COLLECTIONS_SCHEMA = """
+SELECT pg_advisory_xact_lock(hashtext('dataset_collections_schema'));
+
+CREATE TABLE IF NOT EXISTS organization_datasets (
+    organization_id VARCHAR(50) NOT NULL,
+    dataset_id VARCHAR(50) NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (organization_id, dataset_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_organization_datasets_dataset
+    ON organization_datasets (dataset_id);
+
+CREATE TABLE IF NOT EXISTS user_favorites (
+    user_id VARCHAR(100) NOT NULL,
+    dataset_id VARCHAR(50) NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, dataset_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_user_favorites_dataset
+    ON user_favorites (dataset_id);
+"""
+
+
+def ensure_collections_schema(engine):
+    """Create the organization and favorites junction tables if they are missing"""
+    try:
+        with engine.begin() as connection:
+            connection.exec_driver_sql(COLLECTIONS_SCHEMA)
+        return True
+    except Exception as e:
+        print(f"❌ Could not create collection tables: {e}")
+        return False
+
+
+def favorite_ids(db, user_id: str, dataset_ids):
+    """The subset of dataset_ids the user has favorited, in a single lookup"""
+    if not dataset_ids:
+        return set()
+    result = db.execute(
+        text("SELECT dataset_id FROM user_favorites WHERE user_id = :user_id AND dataset_id = ANY(:ids)"),
+        {"user_id": user_id, "ids": list(dataset_ids)},
+    )
+    return {row[0] for row in result}
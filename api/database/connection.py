@@ -1,56 +1,163 @@
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Nothing here touches the environment or the network at import time. The engine is
+# created by init_engine() from the app lifespan (or lazily on first use in scripts).
+engine = None
+# Separate small pool for the view flush, ranking refresh and graph index jobs
+background_engine = None
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+_engine_lock = threading.Lock()
 
-def get_database_url():
+
+def get_database_url(env=None):
     """
     Get database URL, supporting both direct connection and connection string.
     Prioritizes DATABASE_URL if provided (useful for Supabase and other cloud providers).
+    Reads the process environment unless another mapping (e.g. a parsed .env file) is given.
     """
+    env = os.environ if env is None else env
+
     # Check if full DATABASE_URL is provided (common for cloud providers like Supabase)
-    database_url = os.getenv("DATABASE_URL")
+    database_url = env.get("DATABASE_URL")
     if database_url:
         return database_url
-    
+
     # Fallback to individual connection parameters
     DB_CONFIG = {
-        "host": os.getenv("DB_HOST", "localhost"),
-        "database": os.getenv("DB_NAME", "data_marketplace"),
-        "user": os.getenv("DB_USER", "postgres"),
-        "password": os.getenv("DB_PASSWORD", ""),
-        "port": int(os.getenv("DB_PORT", 5432)),
+        "host": env.get("DB_HOST", "localhost"),
+        "database": env.get("DB_NAME", "data_marketplace"),
+        "user": env.get("DB_USER", "postgres"),
+        "password": env.get("DB_PASSWORD", ""),
+        "port": int(env.get("DB_PORT", 5432)),
     }
-    
+
     return f"postgresql://{DB_CONFIG['user']}:{DB_CONFIG['password']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
 
-# Get database URL
-DATABASE_URL = get_database_url()
 
-# Create SQLAlchemy engine with Supabase-friendly settings
-engine_kwargs = {
-    "pool_pre_ping": False,  # Skip ping to reduce latency
-    "pool_recycle": 3600,    # Longer recycle time
-    "pool_size": 1,          # Single connection for simplicity
-    "max_overflow": 0,       # No overflow
-    "pool_timeout": 10,      # Shorter timeout
-    "echo": False,           # Disable SQL logging
-}
+def get_engine_kwargs(database_url, env=None):
+    """SQLAlchemy engine settings, pool sizing can be overridden from the environment"""
+    env = os.environ if env is None else env
+
+    # Supabase-friendly defaults
+    engine_kwargs = {
+        "pool_pre_ping": False,  # Skip ping to reduce latency
+        "pool_recycle": 3600,    # Longer recycle time
+        "pool_size": int(env.get("DB_POOL_SIZE", 1)),        # Single connection for simplicity
+        "max_overflow": int(env.get("DB_MAX_OVERFLOW", 0)),  # No overflow
+        "pool_timeout": float(env.get("DB_POOL_TIMEOUT", 10)),  # Shorter timeout
+        "echo": False,           # Disable SQL logging
+    }
+
+    # Add SSL requirement for cloud databases (like Supabase)
+    if "supabase.co" in database_url or env.get("DB_HOST", "").endswith("supabase.co"):
+        engine_kwargs["connect_args"] = {"sslmode": "require"}
+
+    return engine_kwargs
+
+
+def init_engine():
+    """Create the engine and bind the session factory, once"""
+    global engine
+
+    with _engine_lock:
+        if engine is not None:
+            return engine
+
+        database_url = get_database_url()
+        print(f"🔗 Connecting to database: {database_url.split('@')[1] if '@' in database_url else 'local database'}")
+
+        engine = create_engine(database_url, **get_engine_kwargs(database_url))
+        SessionLocal.configure(bind=engine)
+        return engine
+
+
+def init_background_engine():
+    """
+    Create the background jobs' engine, once. It has its own DB_BACKGROUND_POOL_SIZE
+    connections, so a ranking recompute or graph load never holds a connection that
+    admission control has promised to a request.
+    """
+    global background_engine
+
+    with _engine_lock:
+        if background_engine is not None:
+            return background_engine
+
+        database_url = get_database_url()
+        engine_kwargs = get_engine_kwargs(database_url)
+        # The jobs take turns on these connections, a flush may wait behind a full graph load
+        engine_kwargs.update(
+            pool_size=int(os.getenv("DB_BACKGROUND_POOL_SIZE", 1)),
+            max_overflow=0,
+            pool_timeout=float(os.getenv("DB_BACKGROUND_POOL_TIMEOUT", 60)),
+        )
+        background_engine = create_engine(database_url, **engine_kwargs)
+        return background_engine
+
+
+def get_engine():
+    """Return the engine, creating it on first use"""
+    return engine if engine is not None else init_engine()
+
+
+def dispose_engine():
+    """Close every pooled connection and forget the engines"""
+    global engine, background_engine
+
+    with _engine_lock:
+        if engine is not None:
+            engine.dispose()
+            engine = None
+        if background_engine is not None:
+            background_engine.dispose()
+            background_engine = None
 
-# Add SSL requirement for cloud databases (like Supabase)
-if "supabase.co" in DATABASE_URL or os.getenv("DB_HOST", "").endswith("supabase.co"):
-    engine_kwargs["connect_args"] = {"sslmode": "require"}
 
-print(f"🔗 Connecting to database: {DATABASE_URL.split('@')[1] if '@' in DATABASE_URL else 'local database'}")
+def warm_pool(connections: int) -> int:
+    """
+    Open up to `connections` pooled connections concurrently, so the first requests
+    do not pay the TCP/TLS handshake. Returns how many connections were opened.
+    """
+    current_engine = get_engine()
+    pool = current_engine.pool
+    # Connections beyond pool_size would just be closed again when returned
+    connections = min(connections, pool.size())
+    if connections <= 0:
+        return 0
+
+    # Hold every connection until all are open, so each worker gets a distinct one
+    barrier = threading.Barrier(connections)
+
+    def open_connection(_):
+        try:
+            with current_engine.connect() as connection:
+                connection.execute(text("SELECT 1"))
+                barrier.wait(timeout=30)
+        except threading.BrokenBarrierError:
+            # Another worker failed, this connection was still opened
+            return True
+        except Exception:
+            barrier.abort()
+            raise
+        return True
+
+    try:
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            opened = sum(1 for ok in executor.map(open_connection, range(connections)) if ok)
+        print(f"🔥 Warmed {opened} database connection(s)")
+        return opened
+    except Exception as e:
+        print(f"❌ Connection pool warm-up failed: {e}")
+        return 0
 
-engine = create_engine(DATABASE_URL, **engine_kwargs)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Database dependency for FastAPI
 def get_db():
+    get_engine()
     db = SessionLocal()
     try:
         yield db
@@ -60,7 +167,7 @@ def get_db():
 # Test connection function
 def test_connection():
     try:
-        with engine.connect() as connection:
+        with get_engine().connect() as connection:
             result = connection.execute(text("SELECT COUNT(*) FROM datasets"))
             count = result.scalar()
             print(f"✅ Database connected! Found {count} datasets")
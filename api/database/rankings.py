@@ -0,0 +1,179 @@
+import os
+import threading
+from typing import Optional
+
+from sqlalchemy import text
+
+# Tables behind the popular/trending endpoints. Views are bucketed per hour by the
+# view counter flush, and the ranking table is rebuilt from them periodically.
+RANKINGS_SCHEMA = """
+-- Workers start together, only one of them runs the DDL at a time
+SELECT pg_advisory_xact_lock(hashtext('dataset_rankings_schema'));
+
+CREATE TABLE IF NOT EXISTS dataset_view_buckets (
+    dataset_id VARCHAR(50) NOT NULL,
+    bucket_start TIMESTAMP NOT NULL,
+    views INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (dataset_id, bucket_start)
+);
+
+CREATE TABLE IF NOT EXISTS dataset_rankings (
+    dataset_id VARCHAR(50) PRIMARY KEY,
+    popular_score DOUBLE PRECISION NOT NULL DEFAULT 0,
+    trending_score DOUBLE PRECISION NOT NULL DEFAULT 0,
+    usage_count INTEGER NOT NULL DEFAULT 0,
+    computed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_dataset_rankings_popular
+    ON dataset_rankings (popular_score DESC, usage_count DESC, dataset_id);
+CREATE INDEX IF NOT EXISTS idx_dataset_rankings_trending
+    ON dataset_rankings (trending_score DESC, usage_count DESC, dataset_id);
+"""
+
+
+def _decay(column, half_life_param):
+    """SQL for 2^(-age / half_life), clamped so very old rows go to zero instead of underflowing"""
+    return (
+        f"EXP(GREATEST(-LN(2) * EXTRACT(EPOCH FROM (CURRENT_TIMESTAMP - {column}))::float8 "
+        f"/ :{half_life_param}, -700))"
+    )
+
+
+# Each view and rating contributes weight * 2^(-age / half_life), computed once for a
+# short (trending) and a long (popular) half-life. Ratings count as rating/5 scaled by
+# rating_weight, so a 5-star rating is worth rating_weight fresh views.
+REFRESH_QUERY = """
+WITH view_scores AS (
+    SELECT
+        dataset_id,
+        SUM(views * {decay_bucket_trending}) AS trending,
+        SUM(views * {decay_bucket_popular}) AS popular
+    FROM dataset_view_buckets
+    GROUP BY dataset_id
+),
+rating_scores AS (
+    SELECT
+        dataset_id,
+        SUM(rating / 5.0 * {decay_rating_trending}) AS trending,
+        SUM(rating / 5.0 * {decay_rating_popular}) AS popular
+    FROM ratings
+    GROUP BY dataset_id
+),
+usage AS (
+    SELECT dataset_id, MAX(usage_count) AS usage_count
+    FROM dataset_metrics
+    GROUP BY dataset_id
+)
+INSERT INTO dataset_rankings (dataset_id, popular_score, trending_score, usage_count, computed_at)
+SELECT
+    d.id,
+    COALESCE(vs.popular, 0) + :rating_weight * COALESCE(rs.popular, 0),
+    COALESCE(vs.trending, 0) + :rating_weight * COALESCE(rs.trending, 0),
+    COALESCE(u.usage_count, 0),
+    CURRENT_TIMESTAMP
+FROM datasets d
+LEFT JOIN view_scores vs ON vs.dataset_id = d.id
+LEFT JOIN rating_scores rs ON rs.dataset_id = d.id
+LEFT JOIN usage u ON u.dataset_id = d.id
+""".format(
+    decay_bucket_trending=_decay("bucket_start", "trending_half_life"),
+    decay_bucket_popular=_decay("bucket_start", "popular_half_life"),
+    decay_rating_trending=_decay("created_at", "trending_half_life"),
+    decay_rating_popular=_decay("created_at", "popular_half_life"),
+)
+
+
+class RankingRefresher:
+    """
+    Periodically rebuilds dataset_rankings so the popular and trending endpoints
+    are a top-N index scan instead of a sort over the whole catalog.
+    """
+
+    def __init__(
+        self,
+        refresh_interval: float = 300.0,
+        trending_half_life_hours: float = 24.0,
+        popular_half_life_hours: float = 720.0,
+        rating_weight: float = 10.0,
+    ):
+        self.refresh_interval = refresh_interval
+        self.trending_half_life_hours = trending_half_life_hours
+        self.popular_half_life_hours = popular_half_life_hours
+        self.rating_weight = rating_weight
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._engine = None
+
+    def ensure_schema(self, engine):
+        """Create the bucket and ranking tables if they are missing"""
+        try:
+            with engine.begin() as connection:
+                connection.exec_driver_sql(RANKINGS_SCHEMA)
+            return True
+        except Exception as e:
+            print(f"❌ Could not create ranking tables: {e}")
+            return False
+
+    def refresh(self) -> bool:
+        """Recompute every dataset's scores in one transaction"""
+        if self._engine is None:
+            return False
+
+        params = {
+            "trending_half_life": self.trending_half_life_hours * 3600,
+            "popular_half_life": self.popular_half_life_hours * 3600,
+            "rating_weight": self.rating_weight,
+        }
+
+        try:
+            with self._engine.begin() as connection:
+                # With several workers only one recomputes, the others skip this round
+                if not connection.execute(text("SELECT pg_try_advisory_xact_lock(hashtext('dataset_rankings'))")).scalar():
+                    return False
+                # Readers keep seeing the previous ranking until this commits
+                connection.execute(text("DELETE FROM dataset_rankings"))
+                connection.execute(text(REFRESH_QUERY), params)
+                # Buckets this old contribute under 0.5% to the popular score
+                connection.execute(
+                    text(
+                        "DELETE FROM dataset_view_buckets "
+                        "WHERE bucket_start < CURRENT_TIMESTAMP - make_interval(hours => :retention)"
+                    ),
+                    {"retention": int(self.popular_half_life_hours * 8)},
+                )
+            return True
+        except Exception as e:
+            print(f"❌ Ranking refresh failed: {e}")
+            return False
+
+    def start(self, engine):
+        """Start refreshing rankings in the background against the given engine"""
+        self._engine = engine
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="ranking-refresh", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background refresh"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        # Refresh right away so a fresh deployment has rankings to serve
+        while not self._stopping.is_set():
+            self.refresh()
+            self._stopping.wait(self.refresh_interval)
+
+
+ranking_refresher = RankingRefresher(
+    refresh_interval=float(os.getenv("RANKINGS_REFRESH_INTERVAL", 300)),
+    trending_half_life_hours=float(os.getenv("RANKINGS_TRENDING_HALF_LIFE_HOURS", 24)),
+    popular_half_life_hours=float(os.getenv("RANKINGS_POPULAR_HALF_LIFE_HOURS", 720)),
+    rating_weight=float(os.getenv("RANKINGS_RATING_WEIGHT", 10)),
+)
@@ -0,0 +1,283 @@
+import math
+import os
+import threading
+import time
+from array import array
+from typing import Optional
+
+from sqlalchemy import text
+
+# Postgres' cumulative write counters for related_datasets move on every insert, update
+# or delete, so the in-memory index knows when to rebuild without a trigger or a shared
+# counter row. The walk index itself is created by migrate_to_supabase.py --create-indexes.
+VERSION_QUERY = """
+SELECT n_tup_ins, n_tup_upd, n_tup_del
+FROM pg_stat_user_tables
+WHERE relid = to_regclass('related_datasets')
+"""
+
+EDGES_QUERY = """
+SELECT dataset_id, related_dataset_id, relationship_type, similarity_score
+FROM related_datasets
+WHERE dataset_id IS NOT NULL AND related_dataset_id IS NOT NULL
+ORDER BY dataset_id, related_dataset_id
+"""
+
+# Breadth-first walk in SQL. Each path carries the ids it visited so cycles end the
+# path; every dataset is then reported at the shallowest depth any path reached it.
+NEIGHBORHOOD_QUERY = """
+WITH RECURSIVE walk (dataset_id, depth, path) AS (
+    SELECT CAST(:root AS VARCHAR), 0, ARRAY[CAST(:root AS VARCHAR)]
+    UNION ALL
+    SELECT rd.related_dataset_id, w.depth + 1, w.path || CAST(rd.related_dataset_id AS VARCHAR)
+    FROM walk w
+    JOIN related_datasets rd ON rd.dataset_id = w.dataset_id
+    WHERE w.depth < :depth
+      AND rd.related_dataset_id IS NOT NULL
+      AND NOT rd.related_dataset_id = ANY(w.path)
+      AND (CAST(:min_score AS NUMERIC) IS NULL OR rd.similarity_score >= CAST(:min_score AS NUMERIC))
+)
+SELECT dataset_id, MIN(depth) AS depth
+FROM walk
+GROUP BY dataset_id
+ORDER BY depth, dataset_id
+LIMIT :max_nodes
+"""
+
+NEIGHBORHOOD_EDGES_QUERY = """
+SELECT dataset_id, related_dataset_id, relationship_type, similarity_score
+FROM related_datasets
+WHERE dataset_id = ANY(:sources)
+  AND related_dataset_id = ANY(:targets)
+  AND (CAST(:min_score AS NUMERIC) IS NULL OR similarity_score >= CAST(:min_score AS NUMERIC))
+ORDER BY dataset_id, related_dataset_id
+"""
+
+
+def _edge(source, target, relationship_type, score):
+    return {
+        "source": source,
+        "target": target,
+        "relationshipType": relationship_type,
+        "similarityScore": score,
+    }
+
+
+def _select_edges(nodes, depth, edges):
+    """Keep edges that leave an expanded node (depth < max) and land inside the neighbourhood"""
+    depths = dict(nodes)
+    return [
+        edge for edge in edges
+        if depths.get(edge["source"], depth) < depth and edge["target"] in depths
+    ]
+
+
+class AdjacencyGraph:
+    """
+    Compressed sparse row adjacency for related_datasets: the outgoing edges of node i
+    are targets[offsets[i]:offsets[i + 1]], with scores and relationship types in
+    parallel arrays. Dataset ids are interned to ints once at build time.
+    """
+
+    def __init__(self, rows, version=None):
+        self.version = version
+        self.ids = []
+        self.index = {}
+        self.type_names = []
+        type_index = {}
+
+        sources = array("i")
+        row_targets = array("i")
+        row_scores = array("d")
+        row_types = array("H")
+        for source, target, relationship_type, score in rows:
+            sources.append(self._intern(source))
+            row_targets.append(self._intern(target))
+            code = type_index.get(relationship_type)
+            if code is None:
+                code = type_index[relationship_type] = len(self.type_names)
+                self.type_names.append(relationship_type)
+            row_types.append(code)
+            row_scores.append(float(score) if score is not None else math.nan)
+
+        # Counting sort by source: offsets are the running edge count per node
+        counts = [0] * (len(self.ids) + 1)
+        for source in sources:
+            counts[source + 1] += 1
+        for i in range(1, len(counts)):
+            counts[i] += counts[i - 1]
+        self.offsets = array("q", counts)
+
+        edge_count = len(sources)
+        self.targets = array("i", bytes(4 * edge_count))
+        self.scores = array("d", bytes(8 * edge_count))
+        self.types = array("H", bytes(2 * edge_count))
+        slots = counts[:-1]
+        for row, source in enumerate(sources):
+            slot = slots[source]
+            slots[source] = slot + 1
+            self.targets[slot] = row_targets[row]
+            self.scores[slot] = row_scores[row]
+            self.types[slot] = row_types[row]
+
+    def _intern(self, dataset_id):
+        node = self.index.get(dataset_id)
+        if node is None:
+            node = self.index[dataset_id] = len(self.ids)
+            self.ids.append(dataset_id)
+        return node
+
+    @property
+    def edge_count(self):
+        return len(self.targets)
+
+    def neighborhood(self, root: str, depth: int, min_score: Optional[float], max_nodes: int):
+        """
+        Level-by-level BFS from root. Returns ([(id, depth)], edges, truncated), with nodes
+        ordered by (depth, id) like the SQL walk so both paths answer identically.
+        """
+        ids = self.ids
+        start = self.index.get(root)
+        if start is None:
+            return [(root, 0)], [], False
+
+        seen = {start}
+        nodes = [(root, 0)]
+        frontier = [start]
+        truncated = False
+        level = 0
+        while frontier and level < depth:
+            level += 1
+            candidates = set()
+            for node in frontier:
+                for edge in range(self.offsets[node], self.offsets[node + 1]):
+                    if min_score is not None and not self.scores[edge] >= min_score:
+                        continue
+                    target = self.targets[edge]
+                    if target not in seen:
+                        candidates.add(target)
+
+            next_level = sorted(candidates, key=ids.__getitem__)
+            room = max_nodes - len(nodes)
+            if len(next_level) > room:
+                next_level = next_level[:room]
+                truncated = True
+            seen.update(next_level)
+            nodes.extend((ids[node], level) for node in next_level)
+            frontier = next_level
+            if truncated:
+                break
+
+        edges = []
+        for dataset_id, node_depth in nodes:
+            if node_depth >= depth:
+                continue
+            node = self.index[dataset_id]
+            for edge in range(self.offsets[node], self.offsets[node + 1]):
+                if min_score is not None and not self.scores[edge] >= min_score:
+                    continue
+                target = self.targets[edge]
+                if target in seen:
+                    score = self.scores[edge]
+                    edges.append(
+                        _edge(dataset_id, ids[target], self.type_names[self.types[edge]], None if math.isnan(score) else score)
+                    )
+        edges.sort(key=lambda edge: (edge["source"], edge["target"]))
+        return nodes, edges, truncated
+
+
+def sql_neighborhood(db, root: str, depth: int, min_score: Optional[float], max_nodes: int):
+    """The same neighbourhood as AdjacencyGraph.neighborhood, as a recursive CTE"""
+    params = {"root": root, "depth": depth, "min_score": min_score, "max_nodes": max_nodes + 1}
+    nodes = [(row[0], row[1]) for row in db.execute(text(NEIGHBORHOOD_QUERY), params)]
+    truncated = len(nodes) > max_nodes
+    nodes = nodes[:max_nodes]
+
+    sources = [dataset_id for dataset_id, node_depth in nodes if node_depth < depth]
+    edges = [
+        _edge(row[0], row[1], row[2], float(row[3]) if row[3] is not None else None)
+        for row in db.execute(
+            text(NEIGHBORHOOD_EDGES_QUERY),
+            {"sources": sources, "targets": [dataset_id for dataset_id, _ in nodes], "min_score": min_score},
+        )
+    ]
+    return nodes, _select_edges(nodes, depth, edges), truncated
+
+
+class RelatedGraphIndex:
+    """
+    Keeps an AdjacencyGraph of related_datasets in memory and rebuilds it in the
+    background whenever the table's write counters change.
+    """
+
+    def __init__(self, poll_interval: float = 30.0, enabled: bool = True):
+        self.poll_interval = poll_interval
+        self.enabled = enabled
+        self.graph: Optional[AdjacencyGraph] = None
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._engine = None
+
+    def _current_version(self, connection):
+        try:
+            row = connection.execute(text(VERSION_QUERY)).fetchone()
+            return tuple(row) if row is not None else None
+        except Exception:
+            # Statistics not readable: fall back to rebuilding on every poll
+            connection.rollback()
+            return None
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rebuild the adjacency index if related_datasets changed since the last build"""
+        if self._engine is None:
+            return False
+
+        try:
+            # Counters are read before the edges' snapshot is taken, so a write landing in
+            # between is picked up by the next poll instead of being missed
+            with self._engine.connect() as connection:
+                version = self._current_version(connection)
+                if not force and version is not None and self.graph is not None and self.graph.version == version:
+                    return False
+                started = time.perf_counter()
+                graph = AdjacencyGraph(connection.execute(text(EDGES_QUERY)), version)
+            self.graph = graph
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"🕸️ Related dataset graph loaded: {len(graph.ids)} datasets, {graph.edge_count} edges ({elapsed:.0f} ms)")
+            return True
+        except Exception as e:
+            print(f"❌ Related dataset graph refresh failed: {e}")
+            return False
+
+    def neighborhood(self, db, root: str, depth: int, min_score: Optional[float], max_nodes: int):
+        """Answer from the in-memory index when it is loaded, otherwise with the recursive CTE"""
+        graph = self.graph
+        if graph is not None:
+            return graph.neighborhood(root, depth, min_score, max_nodes)
+        return sql_neighborhood(db, root, depth, min_score, max_nodes)
+
+    def start(self, engine):
+        self._engine = engine
+        if not self.enabled or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="related-graph-index", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 5)
+            self._thread = None
+        self.graph = None
+
+    def _run(self):
+        self.refresh(force=True)
+        while not self._stopping.wait(self.poll_interval):
+            self.refresh()
+
+
+related_graph = RelatedGraphIndex(
+    poll_interval=float(os.getenv("RELATED_GRAPH_POLL_INTERVAL", 30)),
+    enabled=os.getenv("RELATED_GRAPH_INDEX", "1") != "0",
+)
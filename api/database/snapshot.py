@@ -0,0 +1,344 @@
+import json
+import os
+import sqlite3
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import text
+
+from database.related_graph import AdjacencyGraph
+
+SNAPSHOT_VERSION = 1
+
+# Relation ids are left untyped so integer keys round-trip unchanged
+SNAPSHOT_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE datasets (
+    id TEXT PRIMARY KEY, technical_id TEXT, name TEXT, description TEXT,
+    business_line TEXT, business_entity TEXT, maturity TEXT, data_lifecycle TEXT,
+    location TEXT, data_domain TEXT, data_subdomain TEXT, data_expert TEXT,
+    data_validator TEXT, data_classification TEXT, created_at TEXT, updated_at TEXT,
+    source_sys_id TEXT, source_sys_name TEXT,
+    has_metrics INTEGER, quality_score NUMERIC, completeness NUMERIC, accuracy NUMERIC,
+    timeliness NUMERIC, usage_count NUMERIC, average_rating NUMERIC,
+    popular_score REAL, trending_score REAL
+);
+CREATE TABLE tags (dataset_id TEXT, name TEXT);
+CREATE TABLE owners (dataset_id TEXT, id, name TEXT, email TEXT, department TEXT, role TEXT);
+CREATE TABLE related (dataset_id TEXT, related_id TEXT, name TEXT, description TEXT, relationship_type TEXT, similarity_score NUMERIC);
+CREATE TABLE ratings (dataset_id TEXT, id, user_id, user_name TEXT, rating INTEGER, comment TEXT, created_at TEXT);
+CREATE TABLE stories (dataset_id TEXT, id, title TEXT, author TEXT, business_line TEXT, summary TEXT, content TEXT);
+CREATE TABLE preview (dataset_id TEXT PRIMARY KEY, columns TEXT, sample_data TEXT, row_count INTEGER);
+"""
+
+# One bulk query per snapshot table, so exporting costs a handful of round trips
+EXPORT_QUERIES = {
+    "datasets": """
+        SELECT
+            d.id, d.technical_id, d.name, d.description, d.business_line, d.business_entity,
+            d.maturity, d.data_lifecycle, d.location, d.data_domain, d.data_subdomain,
+            d.data_expert, d.data_validator, d.data_classification,
+            d.created_at, d.updated_at, d.source_sys_id, d.source_sys_name,
+            m.dataset_id IS NOT NULL, m.quality_score, m.completeness, m.accuracy,
+            m.timeliness, m.usage_count, m.average_rating,
+            {ranking_columns}
+        FROM datasets d
+        LEFT JOIN LATERAL (
+            SELECT dataset_id, quality_score, completeness, accuracy, timeliness, usage_count, average_rating
+            FROM dataset_metrics
+            WHERE dataset_id = d.id
+            LIMIT 1
+        ) m ON TRUE
+        {ranking_join}
+    """,
+    "tags": """
+        SELECT dt.dataset_id, t.name
+        FROM tags t
+        JOIN dataset_tags dt ON t.id = dt.tag_id
+    """,
+    "owners": """
+        SELECT dow.dataset_id, owner.id, owner.name, owner.email, owner.department, dow.role
+        FROM data_owners owner
+        JOIN dataset_owners dow ON owner.id = dow.owner_id
+    """,
+    "related": """
+        SELECT rd.dataset_id, rd.related_dataset_id, d.name, d.description, rd.relationship_type, rd.similarity_score
+        FROM related_datasets rd
+        JOIN datasets d ON rd.related_dataset_id = d.id
+    """,
+    "ratings": """
+        SELECT r.dataset_id, r.id, r.user_id, u.name, r.rating, r.comment, r.created_at
+        FROM ratings r
+        JOIN users u ON r.user_id = u.id
+        ORDER BY r.created_at DESC
+    """,
+    "stories": """
+        SELECT duc.dataset_id, uc.id, uc.title, uc.author, uc.business_line, uc.summary, uc.content
+        FROM use_cases uc
+        JOIN dataset_use_cases duc ON uc.id = duc.use_case_id
+    """,
+    "preview": """
+        SELECT dataset_id, columns, sample_data, row_count
+        FROM dataset_preview
+    """,
+}
+
+
+def _to_sqlite(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def export_snapshot(engine, path: str) -> Dict[str, int]:
+    """
+    Write the catalog to a SQLite snapshot at `path`, returns row counts per table.
+    The file is written next to the target and renamed into place, so readers
+    never see a half-written snapshot.
+    """
+    with engine.connect() as connection:
+        has_rankings = connection.execute(text("SELECT to_regclass('dataset_rankings') IS NOT NULL")).scalar()
+        if has_rankings:
+            ranking_columns = "r.popular_score, r.trending_score"
+            ranking_join = "LEFT JOIN dataset_rankings r ON r.dataset_id = d.id"
+        else:
+            ranking_columns = "NULL, NULL"
+            ranking_join = ""
+
+        tmp_path = f"{path}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        counts = {}
+        snapshot = sqlite3.connect(tmp_path)
+        try:
+            snapshot.executescript(SNAPSHOT_SCHEMA)
+            for table, query in EXPORT_QUERIES.items():
+                query = query.format(ranking_columns=ranking_columns, ranking_join=ranking_join)
+                rows = [tuple(_to_sqlite(value) for value in row) for row in connection.execute(text(query))]
+                if rows:
+                    placeholders = ", ".join("?" for _ in rows[0])
+                    snapshot.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows)
+                counts[table] = len(rows)
+
+            snapshot.executemany(
+                "INSERT INTO meta VALUES (?, ?)",
+                [("version", str(SNAPSHOT_VERSION)), ("exported_at", datetime.utcnow().isoformat())],
+            )
+            snapshot.commit()
+        finally:
+            snapshot.close()
+
+    os.replace(tmp_path, path)
+    return counts
+
+
+def _parse_timestamp(value):
+    return datetime.fromisoformat(value) if value else None
+
+
+def _trigrams(value: str) -> Set[str]:
+    return {value[i:i + 3] for i in range(len(value) - 2)}
+
+
+class SnapshotStore:
+    """
+    Read-only catalog loaded from a snapshot file into memory.
+    Datasets are kept in list order (updated_at DESC, as the live list query), and
+    filters and search resolve to sets of positions in that order:
+    - business_line and data_domain through exact-value indexes
+    - search through a trigram index, with candidates verified by substring match
+      (the same case-insensitive substring semantics as the live ILIKE query)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        snapshot = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            self.meta = dict(snapshot.execute("SELECT key, value FROM meta"))
+            self._load(snapshot)
+        finally:
+            snapshot.close()
+
+    def _load(self, snapshot):
+        relations = defaultdict(lambda: defaultdict(list))
+        for table in ("tags", "owners", "related", "ratings", "stories"):
+            for row in snapshot.execute(f"SELECT * FROM {table}"):
+                relations[table][row[0]].append(row[1:])
+        previews = {row[0]: row[1:] for row in snapshot.execute("SELECT * FROM preview")}
+        # Related-dataset adjacency for the /graph endpoint
+        self.graph = AdjacencyGraph(
+            (dataset_id, r[0], r[3], r[4])
+            for dataset_id, related in relations["related"].items()
+            for r in related
+        )
+
+        rows = snapshot.execute("SELECT * FROM datasets").fetchall()
+        # Same order as ORDER BY updated_at DESC, id DESC in Postgres, where NULLs sort first
+        rows.sort(key=lambda row: (row[15] is None, row[15] or "", row[0]), reverse=True)
+
+        self.order: List[str] = []
+        self.cards = []
+        self.details: Dict[str, dict] = {}
+        self.by_business_line: Dict[str, Set[int]] = defaultdict(set)
+        self.by_data_domain: Dict[str, Set[int]] = defaultdict(set)
+        self.search_text: List[str] = []
+        self.trigram_index: Dict[str, Set[int]] = defaultdict(set)
+        scores = []
+
+        for position, row in enumerate(rows):
+            dataset_id = row[0]
+            updated_at = _parse_timestamp(row[15])
+            self.order.append(dataset_id)
+            # Same column order as CARD_COLUMNS, so dataset_card() can build the list shape
+            self.cards.append(
+                (row[0], row[2], row[3], row[4], row[9], row[6], row[19], row[24], row[23],
+                 updated_at, row[11], row[12], row[16], row[17])
+            )
+            scores.append((row[25] or 0, row[26] or 0, row[23] or 0, dataset_id, position))
+
+            if row[4] is not None:
+                self.by_business_line[row[4]].add(position)
+            if row[9] is not None:
+                self.by_data_domain[row[9]].add(position)
+
+            search_text = f"{row[2] or ''}\n{row[3] or ''}".lower()
+            self.search_text.append(search_text)
+            for trigram in _trigrams(search_text):
+                self.trigram_index[trigram].add(position)
+
+            self.details[dataset_id] = self._build_detail(row, updated_at, relations, previews.get(dataset_id))
+
+        # (score, position) lists, best first, ties broken like the ranking indexes
+        self.popular = [(s[0], s[4]) for s in sorted(scores, key=lambda s: (-s[0], -s[2], s[3]))]
+        self.trending = [(s[1], s[4]) for s in sorted(scores, key=lambda s: (-s[1], -s[2], s[3]))]
+
+    def _build_detail(self, row, updated_at, relations, preview_row):
+        dataset_id = row[0]
+        data_owner = None
+        data_steward = None
+        for owner_id, name, email, department, role in relations["owners"][dataset_id]:
+            owner_data = {"id": owner_id, "name": name, "email": email, "department": department}
+            if role == "owner":
+                data_owner = owner_data
+            elif role == "steward":
+                data_steward = owner_data
+
+        return {
+            "id": row[0],
+            "technicalId": row[1],
+            "name": row[2],
+            "description": row[3],
+            "businessLine": row[4],
+            "businessEntity": row[5],
+            "maturity": row[6],
+            "dataLifecycle": row[7],
+            "location": row[8],
+            "dataDomain": row[9],
+            "dataSubDomain": row[10],
+            "dataExpert": row[11],
+            "dataValidator": row[12],
+            "dataClassification": row[13],
+            "createdAt": row[14],
+            "updatedAt": updated_at.isoformat() if updated_at else None,
+            "sourceSysId": row[16],
+            "sourceSysName": row[17],
+            "metrics": {
+                "qualityScore": row[19],
+                "completeness": row[20],
+                "accuracy": row[21],
+                "timeliness": row[22],
+                "usageCount": row[23],
+                "averageRating": row[24],
+            }
+            if row[18]
+            else None,
+            "dataOwner": data_owner,
+            "dataSteward": data_steward,
+            "tags": [tag[0] for tag in relations["tags"][dataset_id]],
+            "ratings": [
+                {"id": r[0], "userId": r[1], "userName": r[2], "rating": r[3], "comment": r[4], "createdAt": r[5]}
+                for r in relations["ratings"][dataset_id]
+            ],
+            "stories": [
+                {"id": s[0], "title": s[1], "author": s[2], "businessLine": s[3], "summary": s[4], "content": s[5]}
+                for s in relations["stories"][dataset_id]
+            ],
+            "relatedDatasets": [
+                {"id": r[0], "name": r[1], "description": r[2], "relationshipType": r[3], "similarityScore": r[4]}
+                for r in relations["related"][dataset_id]
+            ],
+            "preview": {
+                "columns": json.loads(preview_row[0]) if preview_row[0] else None,
+                "sampleData": json.loads(preview_row[1]) if preview_row[1] else None,
+                "rowCount": preview_row[2],
+            }
+            if preview_row
+            else None,
+        }
+
+    def _search(self, search: str, candidates: Optional[Set[int]]) -> Set[int]:
+        term = search.lower()
+        grams = _trigrams(term)
+        if grams:
+            # Intersect the smallest posting lists first
+            postings = sorted((self.trigram_index.get(gram, set()) for gram in grams), key=len)
+            matches = set(postings[0])
+            for posting in postings[1:]:
+                matches &= posting
+                if not matches:
+                    break
+        else:
+            matches = set(range(len(self.order)))
+
+        if candidates is not None:
+            matches &= candidates
+        return {position for position in matches if term in self.search_text[position]}
+
+    def list_datasets(self, page: int, limit: int, search=None, business_line=None, data_domain=None):
+        """Card rows and total count for one page, filtered like the live list query"""
+        positions: Optional[Set[int]] = None
+        if business_line:
+            positions = set(self.by_business_line.get(business_line, set()))
+        if data_domain:
+            domain = self.by_data_domain.get(data_domain, set())
+            positions = positions & domain if positions is not None else set(domain)
+        if search:
+            positions = self._search(search, positions)
+
+        offset = (page - 1) * limit
+        if positions is None:
+            return self.cards[offset:offset + limit], len(self.cards)
+
+        ordered = sorted(positions)
+        return [self.cards[position] for position in ordered[offset:offset + limit]], len(ordered)
+
+    def ranked(self, ranking: str, limit: int):
+        """(card row, score) pairs for the top-N popular or trending datasets"""
+        order = self.popular if ranking == "popular" else self.trending
+        return [(self.cards[position], score) for score, position in order[:limit]]
+
+    def detail(self, dataset_id: str) -> Optional[dict]:
+        return self.details.get(dataset_id)
+
+
+_store: Optional[SnapshotStore] = None
+
+
+def load_snapshot(path: str) -> SnapshotStore:
+    """Load (or reload) the process-wide snapshot store"""
+    global _store
+    _store = SnapshotStore(path)
+    return _store
+
+
+def get_snapshot() -> SnapshotStore:
+    if _store is None:
+        return load_snapshot(os.getenv("SNAPSHOT_PATH", "catalog.snapshot.sqlite"))
+    return _store
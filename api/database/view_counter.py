@@ -0,0 +1,157 @@
+import os
+import threading
+from typing import Dict, Optional
+
+from sqlalchemy import exc, text
+
+
+class ViewCounter:
+    """
+    Write-behind buffer for dataset view counts.
+    Views are added to in-memory counters and flushed to dataset_metrics.usage_count
+    (and the hourly dataset_view_buckets) in one batched transaction, either on a
+    timer or once enough distinct datasets are pending. This keeps hot datasets from being row-locked on every view.
+    """
+
+    def __init__(self, flush_interval: float = 5.0, flush_threshold: int = 500, max_pending: int = 10000):
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self.max_pending = max_pending
+        # Turned off when dataset_view_buckets cannot be written (see ranking_refresher.ensure_schema)
+        self.bucket_views = True
+        self._pending: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._engine = None
+
+    def record(self, dataset_id: str, count: int = 1) -> bool:
+        """Add views for a dataset to the pending counters, False if the buffer is full"""
+        with self._lock:
+            if dataset_id not in self._pending and len(self._pending) >= self.max_pending:
+                # Bounded memory: new datasets wait until the next flush empties the buffer
+                self._wakeup.set()
+                return False
+            self._pending[dataset_id] = self._pending.get(dataset_id, 0) + count
+            pending_size = len(self._pending)
+
+        # Wake the flusher early when the batch is large enough
+        if pending_size >= self.flush_threshold:
+            self._wakeup.set()
+        return True
+
+    def pending(self) -> int:
+        """Total number of views not yet written to the database"""
+        with self._lock:
+            return sum(self._pending.values())
+
+    def flush(self) -> int:
+        """Write all pending increments in one transaction, returns the number of datasets updated"""
+        if self._engine is None:
+            return 0
+
+        # Only one flush at a time so batches are never applied out of order
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, {}
+
+            if not batch:
+                return 0
+
+            values = []
+            params = {}
+            # Sorted ids make concurrent flushes from several workers lock rows in the same order
+            for i, (dataset_id, delta) in enumerate(sorted(batch.items())):
+                values.append(f"(:id{i}, CAST(:delta{i} AS INTEGER))")
+                params[f"id{i}"] = dataset_id
+                params[f"delta{i}"] = delta
+
+            query = f"""
+            UPDATE dataset_metrics
+            SET usage_count = COALESCE(dataset_metrics.usage_count, 0) + v.delta,
+                updated_at = CURRENT_TIMESTAMP
+            FROM (VALUES {", ".join(values)}) AS v(dataset_id, delta)
+            JOIN datasets d ON d.id = v.dataset_id
+            WHERE dataset_metrics.dataset_id = v.dataset_id
+            RETURNING dataset_metrics.dataset_id
+            """
+
+            # Hourly buckets feed the time-decayed trending and popular rankings
+            buckets_query = f"""
+            INSERT INTO dataset_view_buckets (dataset_id, bucket_start, views)
+            SELECT d.id, date_trunc('hour', CURRENT_TIMESTAMP), v.delta
+            FROM (VALUES {", ".join(values)}) AS v(dataset_id, delta)
+            JOIN datasets d ON d.id = v.dataset_id
+            ON CONFLICT (dataset_id, bucket_start)
+            DO UPDATE SET views = dataset_view_buckets.views + EXCLUDED.views
+            """
+
+            try:
+                with self._engine.begin() as connection:
+                    updated = {row[0] for row in connection.execute(text(query), params)}
+                    if self.bucket_views:
+                        self._write_buckets(connection, buckets_query, params)
+            except (exc.DataError, exc.IntegrityError) as e:
+                # Retrying would fail the same way and block every later flush
+                print(f"❌ View count flush rejected, {len(batch)} datasets dropped: {e}")
+                return 0
+            except Exception as e:
+                # Put the batch back so the increments are retried on the next flush
+                with self._lock:
+                    for dataset_id, delta in batch.items():
+                        self._pending[dataset_id] = self._pending.get(dataset_id, 0) + delta
+                print(f"❌ View count flush failed, {len(batch)} datasets requeued: {e}")
+                return 0
+
+            # Unknown datasets, and datasets without a dataset_metrics row, have no usage_count to add to
+            dropped = sorted(set(batch) - updated)
+            if dropped:
+                print(f"⚠️ usage_count not updated for {len(dropped)} unknown or metric-less dataset(s): {', '.join(dropped[:10])}")
+
+            return len(batch) - len(dropped)
+
+    def _write_buckets(self, connection, buckets_query, params):
+        """Bucket the batch in a savepoint, so a missing bucket table never blocks usage_count"""
+        try:
+            with connection.begin_nested():
+                connection.execute(text(buckets_query), params)
+        except exc.ProgrammingError as e:
+            # Missing table or privileges: every later flush would fail the same way
+            self.bucket_views = False
+            print(f"⚠️ View buckets disabled, rankings will not see new views: {e.orig}")
+
+    def start(self, engine):
+        """Start the background flusher against the given engine"""
+        self._engine = engine
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="view-counter-flush", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the flusher and write out any pending increments"""
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if self._stopping.is_set():
+                break
+            self.flush()
+
+
+view_counter = ViewCounter(
+    flush_interval=float(os.getenv("VIEW_FLUSH_INTERVAL", 5)),
+    flush_threshold=int(os.getenv("VIEW_FLUSH_THRESHOLD", 500)),
+    max_pending=int(os.getenv("VIEW_MAX_PENDING", 10000)),
+)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Export the dataset catalog to a read-only snapshot file.
+Usage: python export_snapshot.py [output_path]
+
+The snapshot (SQLite) holds datasets, metrics, rankings, tags, owners, related
+datasets, ratings, stories and previews. Serve it with:
+    DATA_BACKEND=snapshot SNAPSHOT_PATH=<output_path> python -m uvicorn main:app
+"""
+
+import os
+import sys
+import time
+from dotenv import load_dotenv
+from database.connection import init_engine
+from database.snapshot import SnapshotStore, export_snapshot
+
+# Load environment variables
+load_dotenv()
+
+
+def main():
+    print("📦 MZUI Data Marketplace - Catalog Snapshot Export")
+    print("=" * 50)
+
+    output_path = sys.argv[1] if len(sys.argv) > 1 else os.getenv("SNAPSHOT_PATH", "catalog.snapshot.sqlite")
+
+    try:
+        engine = init_engine()
+        start = time.time()
+        counts = export_snapshot(engine, output_path)
+        elapsed = time.time() - start
+    except Exception as e:
+        print(f"❌ Export failed: {e}")
+        sys.exit(1)
+
+    for table, count in counts.items():
+        print(f"   {table:<10} {count:>8} rows")
+    print(f"✅ Wrote {output_path} ({os.path.getsize(output_path) / 1024:.0f} KB) in {elapsed:.1f}s")
+
+    # Loading it back checks the file and shows the in-memory load time
+    start = time.time()
+    snapshot = SnapshotStore(output_path)
+    print(f"🔍 Loaded {len(snapshot.order)} datasets in {(time.time() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,107 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+import httpx
+from dotenv import load_dotenv
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
-from database.connection import get_db, test_connection
-from routes.datasets import router as datasets_router  # Add this import
+
+# Load environment variables before modules below read their settings
+load_dotenv()
+
+from database.collections import ensure_collections_schema
+from database.connection import dispose_engine, get_db, init_background_engine, init_engine, test_connection, warm_pool
+from database.rankings import ranking_refresher
+from database.related_graph import related_graph
+from database.snapshot import load_snapshot
+from database.view_counter import view_counter
+from middleware.circuit_breaker import database_breaker
+from middleware.compression import CompressionMiddleware, compression_settings
+from middleware.response_cache import response_cache
+from routes.datasets import TRUST_USER_ID_HEADER, router as datasets_router  # Add this import
+from routes.organizations import router as organizations_router
+from routes.snapshot_datasets import router as snapshot_datasets_router, snapshot_info
+from routes.users import router as users_router
+
+# "database" (default) serves live data, "snapshot" serves reads from an exported catalog file
+DATA_BACKEND = os.getenv("DATA_BACKEND", "database").lower()
+
+
+async def prewarm_cache(app: FastAPI, paths):
+    """Request each path through the app once so it is served from the response cache"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://prewarm") as client:
+        for path in paths:
+            try:
+                response = await client.get(path)
+                print(f"🔥 Pre-populated cache for {path} ({response.status_code})")
+            except Exception as e:
+                print(f"❌ Cache pre-population failed for {path}: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if DATA_BACKEND == "snapshot":
+        # No database at all: load the catalog into memory and serve from it
+        snapshot_path = os.getenv("SNAPSHOT_PATH", "catalog.snapshot.sqlite")
+        snapshot = await asyncio.to_thread(load_snapshot, snapshot_path)
+        print(f"📦 Serving {len(snapshot.order)} datasets from snapshot {snapshot_path}")
+        yield
+        return
+
+    engine = init_engine()
+
+    # Open pooled connections concurrently so the first requests skip the connect cost
+    warmup_connections = int(os.getenv("DB_POOL_WARMUP", 0))
+    if warmup_connections > 0:
+        await asyncio.to_thread(warm_pool, warmup_connections)
+
+    # Ranking tables must exist before view counts are bucketed into them; without them
+    # usage_count is still flushed and only the rankings miss new views
+    view_counter.bucket_views = await asyncio.to_thread(ranking_refresher.ensure_schema, engine)
+    await asyncio.to_thread(ensure_collections_schema, engine)
+
+    # Fill the response cache before the refreshers below start competing for connections
+    prewarm_paths = [path for path in os.getenv("CACHE_PREWARM_PATHS", "").split(",") if path.strip()]
+    if prewarm_paths:
+        await prewarm_cache(app, [path.strip() for path in prewarm_paths])
+
+    # Start flushing buffered view counts and refreshing rankings in the background, on
+    # their own connections so requests admitted to the pool never wait behind them
+    background_engine = init_background_engine()
+    view_counter.start(background_engine)
+    ranking_refresher.start(background_engine)
+    # Related-dataset adjacency is loaded in the background, graph requests use SQL until then
+    related_graph.start(background_engine)
+
+    yield
+
+    related_graph.stop()
+    ranking_refresher.stop()
+    # Write out pending view counts before the process exits
+    view_counter.stop()
+    dispose_engine()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Data Marketplace API",
     description="API for the Data Marketplace application",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
+)
+
+# Compress responses and cache dataset reads (inside CORS so cached entries carry no origin headers).
+# Expired entries are served stale while refreshed, and the breaker stops calls to a failing database.
+# X-User-Id only personalises responses when the API trusts it, otherwise it must not bypass the cache.
+private_headers = (b"authorization", b"x-user-id") if TRUST_USER_ID_HEADER else (b"authorization",)
+app.add_middleware(
+    CompressionMiddleware,
+    cache=response_cache,
+    breaker=database_breaker,
+    private_headers=private_headers,
+    **compression_settings(),
 )
 
 # Enable CORS for React frontend
@@ -21,7 +114,12 @@ app.add_middleware(
 )
 
 # Include dataset routes
-app.include_router(datasets_router)  # Add this line
+if DATA_BACKEND == "snapshot":
+    app.include_router(snapshot_datasets_router)
+else:
+    app.include_router(datasets_router)  # Add this line
+    app.include_router(organizations_router)
+    app.include_router(users_router)
 
 # Health check endpoint
 @app.get("/")
@@ -31,6 +129,9 @@ async def root():
 # Database health check
 @app.get("/health")
 async def health_check():
+    if DATA_BACKEND == "snapshot":
+        return {"status": "healthy", **snapshot_info()}
+
     db_status = test_connection()
     return {
         "status": "healthy" if db_status else "unhealthy",
@@ -45,6 +146,7 @@ async def get_dataset_count(db: Session = Depends(get_db)):
     count = result.scalar()
     return {"total_datasets": count}
 
+# Single process for local runs, production uses serve.py (multiple workers, uvloop/httptools)
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -0,0 +1,65 @@
+import os
+import time
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a failing dependency. After failure_threshold consecutive
+    failures the circuit opens and allow() refuses everything for reset_timeout seconds;
+    then one trial request is let through (half-open) and its outcome closes the circuit
+    again or re-opens it for another reset_timeout.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        """Whether a request may go to the dependency now"""
+        if self.failure_threshold <= 0 or self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+        if self.state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def retry_after(self) -> int:
+        """Seconds until the next trial request, for Retry-After"""
+        remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+        return max(1, int(remaining + 0.999))
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_neutral(self):
+        """An outcome that says nothing about the dependency, e.g. the request was shed locally"""
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                print(f"⚡ Circuit opened after {self.failures} failure(s), retrying in {self.reset_timeout:.0f}s")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+# Guards the dataset routes' database reads (CIRCUIT_BREAKER_FAILURE_THRESHOLD=0 disables it)
+database_breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv("CIRCUIT_BREAKER_FAILURE_THRESHOLD", 5)),
+    reset_timeout=float(os.getenv("CIRCUIT_BREAKER_RESET_TIMEOUT", 30)),
+)
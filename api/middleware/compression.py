@@ -0,0 +1,350 @@
+import asyncio
+import gzip
+import json
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from database.admission import DATABASE_FAILURE_CODES, ERROR_CODE_HEADER
+from middleware.circuit_breaker import CircuitBreaker
+from middleware.response_cache import CachedResponse, ResponseCache
+
+# brotli and zstandard are optional, encodings are only offered when installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Server preference when the client accepts several encodings with the same q-value
+ENCODING_PREFERENCE = ("zstd", "br", "gzip")
+
+COMPRESSIBLE_TYPES = (b"application/json", b"text/", b"application/javascript")
+
+BREAKER_FAILURE_CODES = {code.encode() for code in DATABASE_FAILURE_CODES}
+
+
+def build_compressors(gzip_level: int = 6, brotli_quality: int = 4, zstd_level: int = 3) -> Dict[str, Callable[[bytes], bytes]]:
+    """Map each available encoding name to a function compressing a whole body"""
+    compressors = {"gzip": lambda body: gzip.compress(body, compresslevel=gzip_level)}
+    if brotli is not None:
+        compressors["br"] = lambda body: brotli.compress(body, quality=brotli_quality)
+    if zstandard is not None:
+        zstd_compressor = zstandard.ZstdCompressor(level=zstd_level)
+        compressors["zstd"] = zstd_compressor.compress
+    return compressors
+
+
+def negotiate_encoding(accept_encoding: str, available: Iterable[str]) -> Optional[str]:
+    """Pick the best available encoding for an Accept-Encoding header, or None for identity"""
+    qualities = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        qualities[token] = q
+
+    best = None
+    best_q = 0.0
+    for encoding in ENCODING_PREFERENCE:
+        if encoding not in available:
+            continue
+        q = qualities.get(encoding, qualities.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _with_vary(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    """Add Accept-Encoding to Vary, merging into an existing Vary header instead of repeating it"""
+    for i, (key, value) in enumerate(headers):
+        if key.lower() == b"vary":
+            if b"accept-encoding" in value.lower() or value.strip() == b"*":
+                return headers
+            return headers[:i] + [(key, value + b", Accept-Encoding")] + headers[i + 1:]
+    return headers + [(b"vary", b"Accept-Encoding")]
+
+
+class CompressionMiddleware:
+    """
+    Negotiates gzip, brotli or zstd for responses above a size threshold.
+    GET responses under the cached prefixes are stored in a ResponseCache as identity
+    bodies, and each compressed variant is stored on the entry the first time it is
+    produced, so cache hits never recompress.
+
+    An expired entry still within the cache's staleness bound is served immediately
+    (X-Cache: STALE) while one background request per key refreshes it. With a circuit
+    breaker, only database failures (pool_timeout, statement_timeout, database_unavailable)
+    on those routes count as failures; while the circuit is open
+    stale entries are served without refreshing and misses get a 503 circuit_open.
+    """
+
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        cache: Optional[ResponseCache] = None,
+        cache_prefixes: Tuple[str, ...] = ("/api/datasets",),
+        cache_exclude: Tuple[str, ...] = ("/api/datasets/test/",),
+        breaker: Optional[CircuitBreaker] = None,
+        private_headers: Tuple[bytes, ...] = (b"authorization",),
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache
+        self.cache_prefixes = cache_prefixes
+        # Diagnostic routes answer errors with a 200 body, which must not be cached
+        self.cache_exclude = cache_exclude
+        self.breaker = breaker
+        # Request headers that personalise the response (e.g. isFavorite flags), lower-case
+        self.private_headers = private_headers
+        self.compressors = build_compressors(gzip_level, brotli_quality, zstd_level)
+        self._revalidating: Set[str] = set()
+        self._background: Set[asyncio.Task] = set()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = scope.get("headers", [])
+        accept_encoding = (_header(request_headers, b"accept-encoding") or b"").decode("latin-1")
+        encoding = negotiate_encoding(accept_encoding, self.compressors)
+
+        cache_key = self._cache_key(scope)
+        if cache_key is not None:
+            entry = self.cache.get(cache_key, allow_stale=True)
+            if entry is not None:
+                if entry.is_fresh():
+                    await self._send_cached(send, entry, encoding, b"HIT")
+                    return
+                # Serve the last good response now and refresh it off the request path
+                if cache_key not in self._revalidating and (self.breaker is None or self.breaker.allow()):
+                    self._revalidate(cache_key, scope)
+                await self._send_cached(send, entry, encoding, b"STALE")
+                return
+
+        guarded = self._guarded(scope)
+        if guarded and not self.breaker.allow():
+            await self._send_circuit_open(send)
+            return
+
+        try:
+            response = await self._run_app(scope, receive, send)
+        except Exception:
+            # A bug in a route is not a database outage; database errors arrive as coded responses
+            if guarded:
+                self.breaker.record_neutral()
+            raise
+
+        if response is None:
+            if guarded:
+                self.breaker.record_neutral()
+            return
+        status, headers, body, streamed = response
+        if guarded:
+            self._record(status, headers)
+        if streamed:
+            return
+
+        if cache_key is not None and self._cacheable(status, headers):
+            entry = self.cache.set(cache_key, status, headers, body)
+            await self._send_cached(send, entry, encoding, b"MISS")
+            return
+
+        if encoding is not None and self._should_compress(headers, body):
+            body = self.compressors[encoding](body)
+            headers = _with_vary(headers + [(b"content-encoding", encoding.encode())])
+        await self._send_body(send, status, headers, body)
+
+    async def _run_app(self, scope, receive, send):
+        """
+        Run the app, buffering a single-message body. Returns (status, headers, body,
+        streamed) or None if no response was started; streaming responses are passed
+        straight through to send and come back with streamed=True.
+        """
+        start_message = None
+        body_chunks = []
+        streaming = False
+
+        async def capture(message):
+            nonlocal start_message, streaming
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            if streaming:
+                await send(message)
+                return
+            if message.get("more_body", False) and not body_chunks:
+                # Streaming responses are passed through untouched
+                streaming = True
+                await send(start_message)
+                await send(message)
+                return
+            body_chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+
+        if start_message is None:
+            return None
+
+        headers = [
+            (key, value)
+            for key, value in start_message.get("headers", [])
+            if key.lower() != b"content-length"
+        ]
+        return start_message["status"], headers, b"".join(body_chunks), streaming
+
+    def _revalidate(self, cache_key: str, scope):
+        """Re-run a GET in the background and replace its cache entry if it succeeds"""
+        self._revalidating.add(cache_key)
+        task = asyncio.get_running_loop().create_task(self._refresh(cache_key, dict(scope)))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _refresh(self, cache_key: str, scope):
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if request_sent:
+                return {"type": "http.disconnect"}
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def discard(message):
+            pass
+
+        try:
+            response = await self._run_app(scope, receive, discard)
+            if response is None:
+                if self._guarded(scope):
+                    self.breaker.record_neutral()
+                return
+            status, headers, body, streamed = response
+            if self._guarded(scope):
+                self._record(status, headers)
+            if not streamed and self._cacheable(status, headers):
+                self.cache.set(cache_key, status, headers, body)
+        except Exception as e:
+            if self._guarded(scope):
+                self.breaker.record_neutral()
+            print(f"❌ Background refresh of {cache_key} failed: {e}")
+        finally:
+            self._revalidating.discard(cache_key)
+
+    def _cache_key(self, scope) -> Optional[str]:
+        if self.cache is None or scope["method"] != "GET":
+            return None
+        path = scope["path"]
+        if not path.startswith(self.cache_prefixes) or path.startswith(self.cache_exclude):
+            return None
+        # Responses personalised for a caller are never shared
+        headers = scope.get("headers", [])
+        if any(_header(headers, name) is not None for name in self.private_headers):
+            return None
+        query = scope.get("query_string", b"").decode("latin-1")
+        return f"{path}?{'&'.join(sorted(query.split('&')))}" if query else path
+
+    def _guarded(self, scope) -> bool:
+        """Requests whose outcome feeds the circuit breaker"""
+        return self.breaker is not None and scope["method"] == "GET" and scope["path"].startswith(self.cache_prefixes)
+
+    def _record(self, status: int, headers):
+        code = _header(headers, ERROR_CODE_HEADER.lower().encode())
+        if code in BREAKER_FAILURE_CODES:
+            self.breaker.record_failure()
+        elif status >= 500:
+            # Shed by admission control or a bug in the route, not a sign the database is down
+            self.breaker.record_neutral()
+        else:
+            self.breaker.record_success()
+
+    @staticmethod
+    def _cacheable(status, headers) -> bool:
+        return (
+            status == 200
+            and _header(headers, b"content-encoding") is None
+            and _header(headers, b"set-cookie") is None
+        )
+
+    def _should_compress(self, headers, body) -> bool:
+        if len(body) < self.minimum_size:
+            return False
+        if _header(headers, b"content-encoding") is not None:
+            return False
+        content_type = _header(headers, b"content-type") or b""
+        return content_type.startswith(COMPRESSIBLE_TYPES)
+
+    async def _send_cached(self, send, entry: CachedResponse, encoding: Optional[str], cache_status: bytes):
+        headers = entry.headers + [(b"x-cache", cache_status), (b"age", str(int(entry.age())).encode())]
+        if cache_status == b"STALE":
+            headers.append((b"warning", b'110 - "Response is Stale"'))
+        body = entry.body
+
+        if encoding is not None and self._should_compress(entry.headers, entry.body):
+            compressed = entry.variants.get(encoding)
+            if compressed is None:
+                compressed = self.compressors[encoding](entry.body)
+                entry.variants[encoding] = compressed
+            body = compressed
+            headers = headers + [(b"content-encoding", encoding.encode())]
+        headers = _with_vary(headers)
+
+        await self._send_body(send, entry.status, headers, body)
+
+    async def _send_circuit_open(self, send):
+        body = json.dumps(
+            {"detail": {"code": "circuit_open", "message": "Database circuit open after repeated failures"}}
+        ).encode()
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"retry-after", str(self.breaker.retry_after()).encode()),
+            (ERROR_CODE_HEADER.lower().encode(), b"circuit_open"),
+        ]
+        await self._send_body(send, 503, headers, body)
+
+    async def _send_body(self, send, status, headers, body):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": headers + [(b"content-length", str(len(body)).encode())],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def compression_settings():
+    """Middleware keyword arguments from the environment"""
+    return {
+        "minimum_size": int(os.getenv("COMPRESSION_MIN_SIZE", 1024)),
+        "gzip_level": int(os.getenv("COMPRESSION_GZIP_LEVEL", 6)),
+        "brotli_quality": int(os.getenv("COMPRESSION_BROTLI_QUALITY", 4)),
+        "zstd_level": int(os.getenv("COMPRESSION_ZSTD_LEVEL", 3)),
+    }
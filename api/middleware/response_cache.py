@@ -0,0 +1,78 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+
+class CachedResponse:
+    """A cached identity response plus every compressed variant produced for it"""
+
+    def __init__(self, status: int, headers: List[Tuple[bytes, bytes]], body: bytes, ttl: float, stale_ttl: float = 0.0):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.created_at = time.monotonic()
+        self.expires_at = self.created_at + ttl
+        # Past expires_at the entry may still be served as stale until stale_until
+        self.stale_until = self.expires_at + stale_ttl
+        # encoding name -> compressed body, filled on first request for that encoding
+        self.variants: Dict[str, bytes] = {}
+
+    def is_fresh(self) -> bool:
+        return time.monotonic() < self.expires_at
+
+    def is_usable(self) -> bool:
+        return time.monotonic() < self.stale_until
+
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+
+class ResponseCache:
+    """
+    In-process LRU cache of GET responses with a per-entry TTL.
+    Compressed bodies are stored on the entry, so a hot entry is compressed
+    once per encoding rather than once per request. Expired entries are kept for
+    another stale_ttl seconds so they can be served while being revalidated.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 512, stale_ttl: float = 0.0):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.stale_ttl = stale_ttl
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[CachedResponse]:
+        """Return the fresh entry for a key, or with allow_stale one still within the staleness bound"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if not entry.is_usable():
+            del self._entries[key]
+            return None
+        if not allow_stale and not entry.is_fresh():
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, status: int, headers: List[Tuple[bytes, bytes]], body: bytes) -> CachedResponse:
+        """Store an identity response, evicting the least recently used entries"""
+        entry = CachedResponse(status, headers, body, self.ttl, self.stale_ttl)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+response_cache = ResponseCache(
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", 30)),
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 512)),
+    stale_ttl=float(os.getenv("RESPONSE_CACHE_STALE_TTL", 300)),
+)
@@ -164,6 +164,43 @@ def create_sample_schema():
     except Exception as e:
         print(f"❌ Schema creation failed: {e}")
 
+# Indexes the API queries rely on. Built CONCURRENTLY, so reads and writes on the existing
+# tables carry on while they are created; run once per database, not on every API start.
+PERFORMANCE_INDEXES = [
+    # Keyset pagination order shared by every dataset list endpoint
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_datasets_updated_at_id "
+    "ON datasets (updated_at DESC, id DESC)",
+    # Related-dataset graph walk
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_related_datasets_dataset "
+    "ON related_datasets (dataset_id, related_dataset_id)",
+]
+
+# Objects earlier API versions created at startup and no longer use
+OBSOLETE_OBJECTS = [
+    "DROP TRIGGER IF EXISTS related_graph_version_bump ON related_datasets",
+    "DROP FUNCTION IF EXISTS bump_related_graph_version()",
+    "DROP TABLE IF EXISTS related_graph_version",
+]
+
+def create_performance_indexes():
+    """Create the API's indexes without locking the tables they cover."""
+    try:
+        database_url = get_database_url()
+        engine_kwargs = {"pool_pre_ping": True}
+        if "supabase.com" in database_url:
+            engine_kwargs["connect_args"] = {"sslmode": "require"}
+
+        engine = create_engine(database_url, **engine_kwargs)
+
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            for statement in OBSOLETE_OBJECTS + PERFORMANCE_INDEXES:
+                connection.execute(text(statement))
+            print(f"✅ {len(PERFORMANCE_INDEXES)} index(es) in place!")
+
+    except Exception as e:
+        print(f"❌ Index creation failed: {e}")
+
 def main():
     """Main function to run the migration script."""
     print("🚀 MZUI Data Marketplace - Supabase Migration Tool")
@@ -172,6 +209,10 @@ def main():
     if len(sys.argv) > 1 and sys.argv[1] == "--create-schema":
         print("Creating basic schema...")
         create_sample_schema()
+
+    if "--create-indexes" in sys.argv[1:]:
+        print("Creating indexes...")
+        create_performance_indexes()
     
     print("Testing database connection...")
     success = test_connection()
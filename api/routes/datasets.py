@@ -1,26 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+import base64
+import json
+import os
+from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from typing import List, Optional
+from database.admission import admission_controlled
+from database.collections import favorite_ids
 from database.connection import get_db
+from database.related_graph import related_graph
+from database.view_counter import view_counter
 
 router = APIRouter(prefix="/api/datasets", tags=["datasets"])
 
+# X-User-Id is trusted as-is, so this may only be enabled behind a gateway that authenticates
+# the caller and sets the header itself. Off by default: every request is anonymous and the
+# favorites routes answer 401.
+TRUST_USER_ID_HEADER = os.getenv("TRUST_USER_ID_HEADER", "0") != "0"
 
-@router.get("/")
-async def get_datasets(
-    page: int = Query(1, ge=1),
-    limit: int = Query(20, ge=1, le=100),
-    search: Optional[str] = None,
-    business_line: Optional[str] = None,
-    data_domain: Optional[str] = None,
-    db: Session = Depends(get_db),
-):
-    """Get paginated list of datasets with optional filtering"""
+# Dataset ids fit datasets.id VARCHAR(50); anything else is rejected before it is buffered
+DATASET_ID_PATTERN = r"^[A-Za-z0-9_.:-]+$"
 
-    # Base query with data expert as owner
-    query = """
-    SELECT 
+# Columns behind the dataset card shape, shared by every list endpoint
+CARD_COLUMNS = """
         d.id,
         d.name,
         d.description,
@@ -35,283 +38,541 @@ async def get_datasets(
         d.data_validator,
         d.source_sys_id,
         d.source_sys_name
+"""
+
+
+def dataset_card(row):
+    """Build the list/card representation of a dataset from a CARD_COLUMNS row"""
+    return {
+        "id": row[0],
+        "name": row[1],
+        "description": row[2],
+        "businessLine": row[3],
+        "dataDomain": row[4],
+        "maturity": row[5],
+        "updatedAt": row[9].isoformat() if row[9] else None,
+        "sourceSysId": row[12],
+        "sourceSysName": row[13],
+        "metrics": {
+            "qualityScore": row[6] if row[6] is not None else 0,
+            "averageRating": row[7] if row[7] is not None else 0,
+            "usageCount": row[8] if row[8] is not None else 0,
+            "completeness": 0,  # Default values for missing metrics
+            "accuracy": 0,
+            "timeliness": 0,
+        },
+        # Use data expert as the data owner
+        "dataOwner": {
+            "id": "",
+            "name": row[10] if row[10] else "Unknown",  # data_expert
+            "email": "",
+            "department": "",
+        },
+        "dataClassification": "Internal",
+        "tags": [],
+        "numberOfDataElements": 0,
+    }
+
+
+def encode_cursor(row):
+    """Opaque keyset cursor for the position just after a CARD_COLUMNS row"""
+    position = [row[9].isoformat() if row[9] else None, row[0]]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    """(updated_at, id) from a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        updated_at, dataset_id = json.loads(base64.urlsafe_b64decode(padded))
+        return (datetime.fromisoformat(updated_at) if updated_at else None), str(dataset_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def get_user_id(x_user_id: Optional[str] = Header(None)) -> Optional[str]:
+    """Identity of the calling user, forwarded by the gateway when TRUST_USER_ID_HEADER is on"""
+    if not TRUST_USER_ID_HEADER:
+        return None
+    return x_user_id.strip() if x_user_id and x_user_id.strip() else None
+
+
+def list_dataset_cards(
+    db: Session,
+    page: int,
+    limit: int,
+    cursor: Optional[str] = None,
+    joins: str = "",
+    conditions: Optional[List[str]] = None,
+    params: Optional[dict] = None,
+    user_id: Optional[str] = None,
+):
+    """
+    One page of dataset cards in (updated_at DESC, id DESC) order, filtered by the given
+    joins/conditions. With a cursor the page starts after it (keyset pagination) and
+    `page` is ignored; otherwise `page` is an OFFSET page as before.
+    """
+    conditions = list(conditions or [])
+    params = dict(params or {})
+    where = " AND ".join(conditions) if conditions else "1=1"
+
+    page_conditions = list(conditions)
+    if cursor:
+        cursor_updated_at, cursor_id = decode_cursor(cursor)
+        params["cursor_id"] = cursor_id
+        if cursor_updated_at is None:
+            # NULL updated_at sorts first in DESC order
+            page_conditions.append("((d.updated_at IS NULL AND d.id < :cursor_id) OR d.updated_at IS NOT NULL)")
+        else:
+            page_conditions.append("(d.updated_at, d.id) < (:cursor_updated_at, :cursor_id)")
+            params["cursor_updated_at"] = cursor_updated_at
+    page_where = " AND ".join(page_conditions) if page_conditions else "1=1"
+
+    # One extra row tells whether there is a next page
+    query = f"""
+    SELECT {CARD_COLUMNS}
     FROM datasets d
+    {joins}
     LEFT JOIN dataset_metrics dm ON d.id = dm.dataset_id
-    WHERE 1=1
+    WHERE {page_where}
+    ORDER BY d.updated_at DESC, d.id DESC
+    LIMIT :limit
     """
+    page_params = dict(params, limit=limit + 1)
+    if not cursor:
+        query += " OFFSET :offset"
+        page_params["offset"] = (page - 1) * limit
+
+    rows = db.execute(text(query), page_params).fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    datasets = [dataset_card(row) for row in rows]
+
+    if user_id:
+        favorites = favorite_ids(db, user_id, [card["id"] for card in datasets])
+        for card in datasets:
+            card["isFavorite"] = card["id"] in favorites
+
+    count_params = {k: v for k, v in params.items() if not k.startswith("cursor_")}
+    total_count = db.execute(
+        text(f"SELECT COUNT(*) FROM datasets d {joins} WHERE {where}"), count_params
+    ).scalar()
+
+    return {
+        "datasets": datasets,
+        "pagination": {
+            "page": page,
+            "limit": limit,
+            "total": total_count,
+            "pages": (total_count + limit - 1) // limit,
+            "nextCursor": encode_cursor(rows[-1]) if has_more else None,
+        },
+    }
 
+
+@router.get("/")
+@admission_controlled("datasets.list")
+def get_datasets(
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="pagination.nextCursor of the previous page"),
+    search: Optional[str] = None,
+    business_line: Optional[str] = None,
+    data_domain: Optional[str] = None,
+    user_id: Optional[str] = Depends(get_user_id),
+    db: Session = Depends(get_db),
+):
+    """Get paginated list of datasets with optional filtering"""
+    conditions = []
     params = {}
 
     # Add search filter
     if search:
-        query += " AND (d.name ILIKE :search OR d.description ILIKE :search)"
-        params["search"] = f"%{search}%"
+        # Match the term literally: % and _ would otherwise act as wildcards
+        conditions.append("(d.name ILIKE :search ESCAPE '\\' OR d.description ILIKE :search ESCAPE '\\')")
+        escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params["search"] = f"%{escaped}%"
 
     # Add business line filter
     if business_line:
-        query += " AND d.business_line = :business_line"
+        conditions.append("d.business_line = :business_line")
         params["business_line"] = business_line
 
     # Add data domain filter
     if data_domain:
-        query += " AND d.data_domain = :data_domain"
+        conditions.append("d.data_domain = :data_domain")
         params["data_domain"] = data_domain
 
-    # Add pagination
-    offset = (page - 1) * limit
-    query += " ORDER BY d.updated_at DESC LIMIT :limit OFFSET :offset"
-    params["limit"] = limit
-    params["offset"] = offset
+    return list_dataset_cards(db, page, limit, cursor, conditions=conditions, params=params, user_id=user_id)
 
-    # Execute query
-    result = db.execute(text(query), params)
-    datasets = []
 
+def get_ranked_datasets(db: Session, score_column: str, limit: int):
+    """Read the top-N datasets from the precomputed ranking table"""
+    query = f"""
+    SELECT {CARD_COLUMNS}, r.{score_column}, r.computed_at
+    FROM (
+        SELECT dataset_id, {score_column}, computed_at
+        FROM dataset_rankings
+        ORDER BY {score_column} DESC, usage_count DESC, dataset_id
+        LIMIT :limit
+    ) r
+    JOIN datasets d ON d.id = r.dataset_id
+    LEFT JOIN dataset_metrics dm ON d.id = dm.dataset_id
+    ORDER BY r.{score_column} DESC, dm.usage_count DESC NULLS LAST, d.id
+    """
+    result = db.execute(text(query), {"limit": limit})
+
+    datasets = []
+    computed_at = None
     for row in result:
-        datasets.append(
+        card = dataset_card(row)
+        card["score"] = row[14]
+        datasets.append(card)
+        computed_at = row[15]
+
+    return {
+        "datasets": datasets,
+        "computedAt": computed_at.isoformat() if computed_at else None,
+    }
+
+
+@router.get("/popular")
+@admission_controlled("datasets.rankings")
+def get_popular_datasets(
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Get the most popular datasets (long half-life decayed views and ratings)"""
+    return get_ranked_datasets(db, "popular_score", limit)
+
+
+@router.get("/trending")
+@admission_controlled("datasets.rankings")
+def get_trending_datasets(
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Get trending datasets (short half-life decayed views and ratings)"""
+    return get_ranked_datasets(db, "trending_score", limit)
+
+
+# Detail fields a caller can select with ?fields=, mapped to their datasets columns
+DETAIL_FIELDS = {
+    "id": "d.id",
+    "technicalId": "d.technical_id",
+    "name": "d.name",
+    "description": "d.description",
+    "businessLine": "d.business_line",
+    "businessEntity": "d.business_entity",
+    "maturity": "d.maturity",
+    "dataLifecycle": "d.data_lifecycle",
+    "location": "d.location",
+    "dataDomain": "d.data_domain",
+    "dataSubDomain": "d.data_subdomain",
+    "dataExpert": "d.data_expert",
+    "dataValidator": "d.data_validator",
+    "dataClassification": "d.data_classification",
+    "createdAt": "d.created_at",
+    "updatedAt": "d.updated_at",
+    "sourceSysId": "d.source_sys_id",
+    "sourceSysName": "d.source_sys_name",
+}
+DETAIL_TIMESTAMP_FIELDS = {"createdAt", "updatedAt"}
+
+METRICS_FIELDS = ["qualityScore", "completeness", "accuracy", "timeliness", "usageCount", "averageRating"]
+
+
+def _load_owners(db: Session, dataset_id: str):
+    owners_query = """
+    SELECT owner.id, owner.name, owner.email, owner.department, dow.role
+    FROM data_owners owner
+    JOIN dataset_owners dow ON owner.id = dow.owner_id
+    WHERE dow.dataset_id = :dataset_id
+    """
+    owners_result = db.execute(text(owners_query), {"dataset_id": dataset_id})
+    data_owner = None
+    data_steward = None
+
+    for owner_row in owners_result:
+        owner_data = {
+            "id": owner_row[0],
+            "name": owner_row[1],
+            "email": owner_row[2],
+            "department": owner_row[3],
+        }
+        if owner_row[4] == "owner":
+            data_owner = owner_data
+        elif owner_row[4] == "steward":
+            data_steward = owner_data
+
+    return {"dataOwner": data_owner, "dataSteward": data_steward}
+
+
+def _load_tags(db: Session, dataset_id: str):
+    tags_query = """
+    SELECT t.name
+    FROM tags t
+    JOIN dataset_tags dt ON t.id = dt.tag_id
+    WHERE dt.dataset_id = :dataset_id
+    """
+    tags_result = db.execute(text(tags_query), {"dataset_id": dataset_id})
+    return {"tags": [tag_row[0] for tag_row in tags_result]}
+
+
+def _load_ratings(db: Session, dataset_id: str):
+    ratings_query = """
+    SELECT r.id, r.user_id, u.name, r.rating, r.comment, r.created_at
+    FROM ratings r
+    JOIN users u ON r.user_id = u.id
+    WHERE r.dataset_id = :dataset_id
+    ORDER BY r.created_at DESC
+    """
+    ratings_result = db.execute(text(ratings_query), {"dataset_id": dataset_id})
+    ratings = []
+
+    for rating_row in ratings_result:
+        ratings.append(
             {
-                "id": row[0],
-                "name": row[1],
-                "description": row[2],
-                "businessLine": row[3],
-                "dataDomain": row[4],
-                "maturity": row[5],
-                "updatedAt": row[9].isoformat() if row[9] else None,
-                "sourceSysId": row[12],
-                "sourceSysName": row[13],
-                "metrics": {
-                    "qualityScore": row[6] if row[6] is not None else 0,
-                    "averageRating": row[7] if row[7] is not None else 0,
-                    "usageCount": row[8] if row[8] is not None else 0,
-                    "completeness": 0,  # Default values for missing metrics
-                    "accuracy": 0,
-                    "timeliness": 0,
-                },
-                # Use data expert as the data owner
-                "dataOwner": {
-                    "id": "",
-                    "name": row[10] if row[10] else "Unknown",  # data_expert
-                    "email": "",
-                    "department": "",
-                },
-                "dataClassification": "Internal",
-                "tags": [],
-                "numberOfDataElements": 0,
+                "id": rating_row[0],
+                "userId": rating_row[1],
+                "userName": rating_row[2],
+                "rating": rating_row[3],
+                "comment": rating_row[4],
+                "createdAt": rating_row[5].isoformat() if rating_row[5] else None,
             }
         )
 
-    # Get total count
-    count_query = "SELECT COUNT(*) FROM datasets d WHERE 1=1"
-    if search:
-        count_query += " AND (d.name ILIKE :search OR d.description ILIKE :search)"
-    if business_line:
-        count_query += " AND d.business_line = :business_line"
-    if data_domain:
-        count_query += " AND d.data_domain = :data_domain"
+    return {"ratings": ratings}
 
-    count_params = {k: v for k, v in params.items() if k not in ["limit", "offset"]}
-    total_result = db.execute(text(count_query), count_params)
-    total_count = total_result.scalar()
+
+def _load_stories(db: Session, dataset_id: str):
+    stories_query = """
+    SELECT uc.id, uc.title, uc.author, uc.business_line, uc.summary, uc.content
+    FROM use_cases uc
+    JOIN dataset_use_cases duc ON uc.id = duc.use_case_id
+    WHERE duc.dataset_id = :dataset_id
+    """
+    stories_result = db.execute(text(stories_query), {"dataset_id": dataset_id})
+    stories = []
+
+    for story_row in stories_result:
+        stories.append(
+            {
+                "id": story_row[0],
+                "title": story_row[1],
+                "author": story_row[2],
+                "businessLine": story_row[3],
+                "summary": story_row[4],
+                "content": story_row[5],
+            }
+        )
+
+    return {"stories": stories}
+
+
+def _load_related(db: Session, dataset_id: str):
+    related_query = """
+    SELECT rd.related_dataset_id, d.name, d.description, rd.relationship_type, rd.similarity_score
+    FROM related_datasets rd
+    JOIN datasets d ON rd.related_dataset_id = d.id
+    WHERE rd.dataset_id = :dataset_id
+    """
+    related_result = db.execute(text(related_query), {"dataset_id": dataset_id})
+    related_datasets = []
+
+    for related_row in related_result:
+        related_datasets.append(
+            {
+                "id": related_row[0],
+                "name": related_row[1],
+                "description": related_row[2],
+                "relationshipType": related_row[3],
+                "similarityScore": related_row[4],
+            }
+        )
+
+    return {"relatedDatasets": related_datasets}
+
+
+def _load_preview(db: Session, dataset_id: str):
+    preview_query = """
+    SELECT columns, sample_data, row_count
+    FROM dataset_preview
+    WHERE dataset_id = :dataset_id
+    """
+    preview_result = db.execute(text(preview_query), {"dataset_id": dataset_id})
+    preview_row = preview_result.fetchone()
 
     return {
-        "datasets": datasets,
-        "pagination": {
-            "page": page,
-            "limit": limit,
-            "total": total_count,
-            "pages": (total_count + limit - 1) // limit,
-        },
+        "preview": {
+            "columns": preview_row[0],
+            "sampleData": preview_row[1],
+            "rowCount": preview_row[2],
+        }
+        if preview_row
+        else None
     }
 
 
+# ?include= values, each one sub-query
+DETAIL_INCLUDES = {
+    "owners": _load_owners,
+    "tags": _load_tags,
+    "ratings": _load_ratings,
+    "stories": _load_stories,
+    "related": _load_related,
+    "preview": _load_preview,
+}
+
+
+def parse_list_param(value: Optional[str], allowed, name: str):
+    """Split a comma-separated query parameter and reject unknown entries"""
+    if value is None:
+        return None
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = [item for item in items if item not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown {name}: {', '.join(unknown)}. Allowed: {', '.join(allowed)}",
+        )
+    return items
+
+
+def resolve_detail_selection(fields: Optional[str], include: Optional[str]):
+    """
+    Turn ?fields= and ?include= into (base fields, whether metrics are wanted, includes).
+    Without either parameter everything is selected; with only fields, no includes.
+    """
+    selected_fields = parse_list_param(fields, list(DETAIL_FIELDS) + ["metrics"], "fields")
+    selected_includes = parse_list_param(include, list(DETAIL_INCLUDES), "include")
+    if selected_includes is None:
+        selected_includes = list(DETAIL_INCLUDES) if selected_fields is None else []
+
+    if selected_fields is None:
+        return list(DETAIL_FIELDS), True, selected_includes
+
+    base_fields = [field for field in DETAIL_FIELDS if field in selected_fields or field == "id"]
+    return base_fields, "metrics" in selected_fields, selected_includes
+
+
 @router.get("/{dataset_id}")
-async def get_dataset_detail(dataset_id: str, db: Session = Depends(get_db)):
-    """Get detailed information about a specific dataset"""
+@admission_controlled("datasets.detail")
+def get_dataset_detail(
+    dataset_id: str,
+    fields: Optional[str] = Query(None, description="Comma-separated dataset fields, plus 'metrics'"),
+    include: Optional[str] = Query(None, description="Comma-separated: " + ",".join(DETAIL_INCLUDES)),
+    db: Session = Depends(get_db),
+):
+    """
+    Get detailed information about a specific dataset.
+    Without fields/include everything is returned. Otherwise only the selected columns
+    are read and only the included sub-queries run (no includes when only fields is given).
+    """
+    base_fields, with_metrics, selected_includes = resolve_detail_selection(fields, include)
+
+    # Basic dataset info, with metrics joined in so they cost no extra round trip
+    columns = [DETAIL_FIELDS[field] for field in base_fields]
+    metrics_join = ""
+    if with_metrics:
+        columns += [
+            "m.dataset_id",
+            "m.quality_score",
+            "m.completeness",
+            "m.accuracy",
+            "m.timeliness",
+            "m.usage_count",
+            "m.average_rating",
+        ]
+        metrics_join = """
+    LEFT JOIN LATERAL (
+        SELECT dataset_id, quality_score, completeness, accuracy, timeliness, usage_count, average_rating
+        FROM dataset_metrics
+        WHERE dataset_id = d.id
+        LIMIT 1
+    ) m ON TRUE"""
+
+    query = f"""
+    SELECT {", ".join(columns)}
+    FROM datasets d{metrics_join}
+    WHERE d.id = :dataset_id
+    """
 
-    try:
-        # Simple query first - just get basic dataset info
-        query = """
-        SELECT 
-            id, technical_id, name, description, business_line, business_entity,
-            maturity, data_lifecycle, location, data_domain, data_subdomain,
-            data_expert, data_validator, data_classification,
-            created_at, updated_at, source_sys_id, source_sys_name
-        FROM datasets 
-        WHERE id = :dataset_id
-        """
+    result = db.execute(text(query), {"dataset_id": dataset_id})
+    row = result.fetchone()
 
-        result = db.execute(text(query), {"dataset_id": dataset_id})
-        row = result.fetchone()
+    if not row:
+        raise HTTPException(status_code=404, detail="Dataset not found")
 
-        if not row:
-            raise HTTPException(status_code=404, detail="Dataset not found")
-
-        # Get metrics separately
-        metrics_query = """
-        SELECT quality_score, completeness, accuracy, timeliness, usage_count, average_rating
-        FROM dataset_metrics 
-        WHERE dataset_id = :dataset_id
-        """
-        metrics_result = db.execute(text(metrics_query), {"dataset_id": dataset_id})
-        metrics_row = metrics_result.fetchone()
-
-        # Get tags
-        tags_query = """
-        SELECT t.name
-        FROM tags t
-        JOIN dataset_tags dt ON t.id = dt.tag_id
-        WHERE dt.dataset_id = :dataset_id
-        """
-        tags_result = db.execute(text(tags_query), {"dataset_id": dataset_id})
-        tags = [tag_row[0] for tag_row in tags_result]
-
-        # Get ratings
-        ratings_query = """
-        SELECT r.id, r.user_id, u.name, r.rating, r.comment, r.created_at
-        FROM ratings r
-        JOIN users u ON r.user_id = u.id
-        WHERE r.dataset_id = :dataset_id
-        ORDER BY r.created_at DESC
-        """
-        ratings_result = db.execute(text(ratings_query), {"dataset_id": dataset_id})
-        ratings = []
-
-        for rating_row in ratings_result:
-            ratings.append(
-                {
-                    "id": rating_row[0],
-                    "userId": rating_row[1],
-                    "userName": rating_row[2],
-                    "rating": rating_row[3],
-                    "comment": rating_row[4],
-                    "createdAt": rating_row[5].isoformat() if rating_row[5] else None,
-                }
-            )
-
-        # Get use cases (stories)
-        stories_query = """
-        SELECT uc.id, uc.title, uc.author, uc.business_line, uc.summary, uc.content
-        FROM use_cases uc
-        JOIN dataset_use_cases duc ON uc.id = duc.use_case_id
-        WHERE duc.dataset_id = :dataset_id
-        """
-        stories_result = db.execute(text(stories_query), {"dataset_id": dataset_id})
-        stories = []
-
-        for story_row in stories_result:
-            stories.append(
-                {
-                    "id": story_row[0],
-                    "title": story_row[1],
-                    "author": story_row[2],
-                    "businessLine": story_row[3],
-                    "summary": story_row[4],
-                    "content": story_row[5],
-                }
-            )
-
-        # Get data owners
-        owners_query = """
-        SELECT owner.id, owner.name, owner.email, owner.department, dow.role
-        FROM data_owners owner
-        JOIN dataset_owners dow ON owner.id = dow.owner_id
-        WHERE dow.dataset_id = :dataset_id
-        """
-        owners_result = db.execute(text(owners_query), {"dataset_id": dataset_id})
-        data_owner = None
-        data_steward = None
-
-        for owner_row in owners_result:
-            owner_data = {
-                "id": owner_row[0],
-                "name": owner_row[1],
-                "email": owner_row[2],
-                "department": owner_row[3],
-            }
-            if owner_row[4] == "owner":
-                data_owner = owner_data
-            elif owner_row[4] == "steward":
-                data_steward = owner_data
-
-        # Get related datasets
-        related_query = """
-        SELECT rd.related_dataset_id, d.name, d.description, rd.relationship_type, rd.similarity_score
-        FROM related_datasets rd
-        JOIN datasets d ON rd.related_dataset_id = d.id
-        WHERE rd.dataset_id = :dataset_id
-        """
-        related_result = db.execute(text(related_query), {"dataset_id": dataset_id})
-        related_datasets = []
-
-        for related_row in related_result:
-            related_datasets.append(
-                {
-                    "id": related_row[0],
-                    "name": related_row[1],
-                    "description": related_row[2],
-                    "relationshipType": related_row[3],
-                    "similarityScore": related_row[4],
-                }
-            )
-
-        # Get preview data
-        preview_query = """
-        SELECT columns, sample_data, row_count
-        FROM dataset_preview
-        WHERE dataset_id = :dataset_id
-        """
-        preview_result = db.execute(text(preview_query), {"dataset_id": dataset_id})
-        preview_row = preview_result.fetchone()
-
-        # Build response
-        dataset = {
-            "id": row[0],
-            "technicalId": row[1],
-            "name": row[2],
-            "description": row[3],
-            "businessLine": row[4],
-            "businessEntity": row[5],
-            "maturity": row[6],
-            "dataLifecycle": row[7],
-            "location": row[8],
-            "dataDomain": row[9],
-            "dataSubDomain": row[10],
-            "dataExpert": row[11],
-            "dataValidator": row[12],
-            "dataClassification": row[13],
-            "createdAt": row[14].isoformat() if row[14] else None,
-            "updatedAt": row[15].isoformat() if row[15] else None,
-            "sourceSysId": row[16],
-            "sourceSysName": row[17],
-            "dataOwner": data_owner,
-            "dataSteward": data_steward,
-            "tags": tags,
-            "ratings": ratings,
-            "stories": stories,
-            "relatedDatasets": related_datasets,
-            "metrics": {
-                "qualityScore": metrics_row[0] if metrics_row else None,
-                "completeness": metrics_row[1] if metrics_row else None,
-                "accuracy": metrics_row[2] if metrics_row else None,
-                "timeliness": metrics_row[3] if metrics_row else None,
-                "usageCount": metrics_row[4] if metrics_row else None,
-                "averageRating": metrics_row[5] if metrics_row else None,
-            }
-            if metrics_row
-            else None,
-            "preview": {
-                "columns": preview_row[0] if preview_row else None,
-                "sampleData": preview_row[1] if preview_row else None,
-                "rowCount": preview_row[2] if preview_row else None,
+    # Build response
+    dataset = {}
+    for i, field in enumerate(base_fields):
+        value = row[i]
+        if field in DETAIL_TIMESTAMP_FIELDS:
+            value = value.isoformat() if value else None
+        dataset[field] = value
+
+    if with_metrics:
+        metrics_row = row[len(base_fields):]
+        dataset["metrics"] = dict(zip(METRICS_FIELDS, metrics_row[1:])) if metrics_row[0] is not None else None
+
+    # One sub-query per included relation
+    for name, loader in DETAIL_INCLUDES.items():
+        if name in selected_includes:
+            dataset.update(loader(db, dataset_id))
+
+    return dataset
+
+
+def graph_response(dataset_id, depth, nodes, edges, truncated, info):
+    """Shape a neighbourhood walk, `info` maps dataset ids to (name, description)"""
+    return {
+        "root": dataset_id,
+        "depth": depth,
+        "nodes": [
+            {
+                "id": node_id,
+                "name": info.get(node_id, (None, None))[0],
+                "description": info.get(node_id, (None, None))[1],
+                "depth": node_depth,
             }
-            if preview_row
-            else None,
-        }
+            for node_id, node_depth in nodes
+        ],
+        "edges": edges,
+        "truncated": truncated,
+    }
 
-        return dataset
 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+@router.get("/{dataset_id}/graph")
+@admission_controlled("datasets.graph")
+def get_dataset_graph(
+    dataset_id: str,
+    depth: int = Query(2, ge=1, le=5),
+    min_score: Optional[float] = Query(None, ge=0, description="Skip relations with a lower similarity score"),
+    max_nodes: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+):
+    """Get the related-dataset neighbourhood up to `depth` hops away, for lineage/exploration views"""
+    nodes, edges, truncated = related_graph.neighborhood(db, dataset_id, depth, min_score, max_nodes)
+
+    # Names for every node in one lookup
+    result = db.execute(
+        text("SELECT id, name, description FROM datasets WHERE id = ANY(:ids)"),
+        {"ids": [node_id for node_id, _ in nodes]},
+    )
+    info = {row[0]: (row[1], row[2]) for row in result}
+    if dataset_id not in info:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    return graph_response(dataset_id, depth, nodes, edges, truncated, info)
+
+
+@router.post("/{dataset_id}/views", status_code=202)
+@router.post("/{dataset_id}/view", status_code=202, include_in_schema=False)
+async def track_dataset_view(dataset_id: str = Path(..., max_length=50, pattern=DATASET_ID_PATTERN)):
+    """Record a dataset view, written to usage_count by the background flusher"""
+    accepted = view_counter.record(dataset_id)
+    return {"datasetId": dataset_id, "accepted": accepted}
 
 
 @router.get("/test/{dataset_id}")
@@ -0,0 +1,88 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from typing import Optional
+from database.admission import admission_controlled
+from database.connection import get_db
+from routes.datasets import get_user_id, list_dataset_cards
+
+router = APIRouter(prefix="/api/organizations", tags=["organizations"])
+
+
+class OrganizationDatasetRequest(BaseModel):
+    datasetId: str
+
+
+def ensure_organization(db: Session, organization_id: str):
+    """Organizations exist through their datasets, so one without any is unknown"""
+    exists = db.execute(
+        text("SELECT 1 FROM organization_datasets WHERE organization_id = :organization_id LIMIT 1"),
+        {"organization_id": organization_id},
+    ).scalar()
+    if not exists:
+        raise HTTPException(status_code=404, detail="Organization not found")
+
+
+@router.get("/{organization_id}/datasets")
+@admission_controlled("organizations.datasets")
+def get_organization_datasets(
+    organization_id: str = Path(..., max_length=50),
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="pagination.nextCursor of the previous page"),
+    user_id: Optional[str] = Depends(get_user_id),
+    db: Session = Depends(get_db),
+):
+    """Get the datasets of an organization, paginated like the dataset list"""
+    ensure_organization(db, organization_id)
+    return list_dataset_cards(
+        db,
+        page,
+        limit,
+        cursor,
+        joins="JOIN organization_datasets od ON od.dataset_id = d.id AND od.organization_id = :organization_id",
+        params={"organization_id": organization_id},
+        user_id=user_id,
+    )
+
+
+@router.post("/{organization_id}/datasets", status_code=201)
+@admission_controlled("organizations.datasets")
+def add_organization_dataset(
+    dataset: OrganizationDatasetRequest,
+    organization_id: str = Path(..., max_length=50),
+    db: Session = Depends(get_db),
+):
+    """Attach a dataset to an organization, creating the organization on its first dataset"""
+    exists = db.execute(text("SELECT 1 FROM datasets WHERE id = :id"), {"id": dataset.datasetId}).scalar()
+    if not exists:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    db.execute(
+        text(
+            "INSERT INTO organization_datasets (organization_id, dataset_id) VALUES (:organization_id, :dataset_id) "
+            "ON CONFLICT (organization_id, dataset_id) DO NOTHING"
+        ),
+        {"organization_id": organization_id, "dataset_id": dataset.datasetId},
+    )
+    db.commit()
+    return {"organizationId": organization_id, "datasetId": dataset.datasetId}
+
+
+@router.delete("/{organization_id}/datasets/{dataset_id}")
+@admission_controlled("organizations.datasets")
+def remove_organization_dataset(
+    organization_id: str = Path(..., max_length=50),
+    dataset_id: str = Path(..., max_length=50),
+    db: Session = Depends(get_db),
+):
+    """Detach a dataset from an organization"""
+    result = db.execute(
+        text("DELETE FROM organization_datasets WHERE organization_id = :organization_id AND dataset_id = :dataset_id"),
+        {"organization_id": organization_id, "dataset_id": dataset_id},
+    )
+    db.commit()
+    if result.rowcount == 0:
+        raise HTTPException(status_code=404, detail="Dataset not found in organization")
+    return {"organizationId": organization_id, "datasetId": dataset_id}
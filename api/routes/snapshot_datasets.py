@@ -0,0 +1,121 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Optional
+from database.snapshot import get_snapshot
+from routes.datasets import DETAIL_INCLUDES, dataset_card, graph_response, resolve_detail_selection
+
+# Read-only dataset routes served from the in-memory catalog snapshot (DATA_BACKEND=snapshot).
+# Paths and response shapes match routes/datasets.py, except that lists are paged by ?page=
+# only: the snapshot has no ?cursor= parameter and its pagination has no nextCursor.
+router = APIRouter(prefix="/api/datasets", tags=["datasets"])
+
+# Response keys produced by each ?include= value
+INCLUDE_KEYS = {
+    "owners": ["dataOwner", "dataSteward"],
+    "tags": ["tags"],
+    "ratings": ["ratings"],
+    "stories": ["stories"],
+    "related": ["relatedDatasets"],
+    "preview": ["preview"],
+}
+
+
+def snapshot_info():
+    snapshot = get_snapshot()
+    return {"backend": "snapshot", "exportedAt": snapshot.meta.get("exported_at")}
+
+
+@router.get("/")
+async def get_datasets(
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    search: Optional[str] = None,
+    business_line: Optional[str] = None,
+    data_domain: Optional[str] = None,
+):
+    """Get paginated list of datasets with optional filtering"""
+    rows, total_count = get_snapshot().list_datasets(page, limit, search, business_line, data_domain)
+
+    return {
+        "datasets": [dataset_card(row) for row in rows],
+        "pagination": {
+            "page": page,
+            "limit": limit,
+            "total": total_count,
+            "pages": (total_count + limit - 1) // limit,
+        },
+    }
+
+
+def get_ranked_datasets(ranking: str, limit: int):
+    snapshot = get_snapshot()
+    datasets = []
+    for row, score in snapshot.ranked(ranking, limit):
+        card = dataset_card(row)
+        card["score"] = score
+        datasets.append(card)
+
+    return {"datasets": datasets, "computedAt": snapshot.meta.get("exported_at")}
+
+
+@router.get("/popular")
+async def get_popular_datasets(limit: int = Query(10, ge=1, le=100)):
+    """Get the most popular datasets, as ranked at export time"""
+    return get_ranked_datasets("popular", limit)
+
+
+@router.get("/trending")
+async def get_trending_datasets(limit: int = Query(10, ge=1, le=100)):
+    """Get trending datasets, as ranked at export time"""
+    return get_ranked_datasets("trending", limit)
+
+
+@router.get("/{dataset_id}")
+async def get_dataset_detail(
+    dataset_id: str,
+    fields: Optional[str] = Query(None, description="Comma-separated dataset fields, plus 'metrics'"),
+    include: Optional[str] = Query(None, description="Comma-separated: " + ",".join(DETAIL_INCLUDES)),
+):
+    """Get detailed information about a specific dataset"""
+    base_fields, with_metrics, selected_includes = resolve_detail_selection(fields, include)
+
+    detail = get_snapshot().detail(dataset_id)
+    if detail is None:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    dataset = {field: detail[field] for field in base_fields}
+    if with_metrics:
+        dataset["metrics"] = detail["metrics"]
+    for name in DETAIL_INCLUDES:
+        if name in selected_includes:
+            for key in INCLUDE_KEYS[name]:
+                dataset[key] = detail[key]
+
+    return dataset
+
+
+@router.get("/{dataset_id}/graph")
+async def get_dataset_graph(
+    dataset_id: str,
+    depth: int = Query(2, ge=1, le=5),
+    min_score: Optional[float] = Query(None, ge=0, description="Skip relations with a lower similarity score"),
+    max_nodes: int = Query(500, ge=1, le=5000),
+):
+    """Get the related-dataset neighbourhood up to `depth` hops away, for lineage/exploration views"""
+    snapshot = get_snapshot()
+    if snapshot.detail(dataset_id) is None:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    nodes, edges, truncated = snapshot.graph.neighborhood(dataset_id, depth, min_score, max_nodes)
+    info = {}
+    for node_id, _ in nodes:
+        detail = snapshot.detail(node_id)
+        if detail is not None:
+            info[node_id] = (detail.get("name"), detail.get("description"))
+    return graph_response(dataset_id, depth, nodes, edges, truncated, info)
+
+
+@router.post("/{dataset_id}/views", status_code=202)
+@router.post("/{dataset_id}/view", status_code=202, include_in_schema=False)
+async def track_dataset_view(dataset_id: str):
+    """Views are not recorded while serving a read-only snapshot"""
+    return {"datasetId": dataset_id, "accepted": False}
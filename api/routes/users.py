@@ -0,0 +1,86 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from typing import Optional
+from database.admission import admission_controlled
+from database.connection import get_db
+from routes.datasets import get_user_id, list_dataset_cards
+
+router = APIRouter(prefix="/api/users", tags=["users"])
+
+
+class FavoriteRequest(BaseModel):
+    datasetId: str
+
+
+def resolve_user(user_id: str, current_user_id: Optional[str]) -> str:
+    """Map the "me" alias to the calling user; favorites are private to their owner"""
+    if not current_user_id:
+        raise HTTPException(status_code=401, detail="X-User-Id header required")
+    if user_id not in ("me", current_user_id):
+        raise HTTPException(status_code=403, detail="Favorites of other users are private")
+    return current_user_id
+
+
+@router.get("/{user_id}/favorites")
+@admission_controlled("users.favorites")
+def get_favorite_datasets(
+    user_id: str,
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="pagination.nextCursor of the previous page"),
+    current_user_id: Optional[str] = Depends(get_user_id),
+    db: Session = Depends(get_db),
+):
+    """Get a user's favorite datasets, paginated like the dataset list"""
+    user_id = resolve_user(user_id, current_user_id)
+    return list_dataset_cards(
+        db,
+        page,
+        limit,
+        cursor,
+        joins="JOIN user_favorites uf ON uf.dataset_id = d.id AND uf.user_id = :user_id",
+        params={"user_id": user_id},
+    )
+
+
+@router.post("/me/favorites", status_code=201)
+@admission_controlled("users.favorites")
+def add_favorite_dataset(
+    favorite: FavoriteRequest,
+    current_user_id: Optional[str] = Depends(get_user_id),
+    db: Session = Depends(get_db),
+):
+    """Add a dataset to the calling user's favorites"""
+    user_id = resolve_user("me", current_user_id)
+    exists = db.execute(text("SELECT 1 FROM datasets WHERE id = :id"), {"id": favorite.datasetId}).scalar()
+    if not exists:
+        raise HTTPException(status_code=404, detail="Dataset not found")
+
+    db.execute(
+        text(
+            "INSERT INTO user_favorites (user_id, dataset_id) VALUES (:user_id, :dataset_id) "
+            "ON CONFLICT (user_id, dataset_id) DO NOTHING"
+        ),
+        {"user_id": user_id, "dataset_id": favorite.datasetId},
+    )
+    db.commit()
+    return {"datasetId": favorite.datasetId, "isFavorite": True}
+
+
+@router.delete("/me/favorites/{dataset_id}")
+@admission_controlled("users.favorites")
+def remove_favorite_dataset(
+    dataset_id: str,
+    current_user_id: Optional[str] = Depends(get_user_id),
+    db: Session = Depends(get_db),
+):
+    """Remove a dataset from the calling user's favorites"""
+    user_id = resolve_user("me", current_user_id)
+    db.execute(
+        text("DELETE FROM user_favorites WHERE user_id = :user_id AND dataset_id = :dataset_id"),
+        {"user_id": user_id, "dataset_id": dataset_id},
+    )
+    db.commit()
+    return {"datasetId": dataset_id, "isFavorite": False}
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Production entry point for the API.
+Usage (from the api directory): python serve.py [--workers N] [--host 0.0.0.0] [--port 8000]
+
+Runs uvicorn with one worker process per CPU (WEB_CONCURRENCY overrides), uvloop and
+httptools when installed, and splits the database connection budget
+(DB_MAX_CONNECTIONS) across the workers, request pools and background jobs included,
+so the total stays under the server's limit.
+On SIGTERM/SIGINT workers stop accepting connections, finish in-flight requests for
+up to GRACEFUL_SHUTDOWN_TIMEOUT seconds, then flush view counts and close their pools.
+For development keep using: python -m uvicorn main:app --reload
+"""
+
+import argparse
+import importlib.util
+import os
+
+import uvicorn
+from dotenv import load_dotenv
+
+
+def default_workers():
+    return int(os.getenv("WEB_CONCURRENCY") or os.cpu_count() or 1)
+
+
+def split_pool_budget(workers: int, max_connections: int, background_connections: int = 1):
+    """
+    Worker count and per-worker request pool size for a total connection budget. Every
+    worker also keeps background_connections for its background jobs and needs at least
+    one connection for requests, so the worker count is capped by the budget.
+    """
+    per_worker = background_connections + 1
+    workers = max(1, min(workers, max_connections // per_worker))
+    return workers, max(1, max_connections // workers - background_connections)
+
+
+def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Run the API with multiple workers")
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", 8000)))
+    parser.add_argument("--access-log", action="store_true", help="log every request (costs throughput)")
+    args = parser.parse_args()
+
+    requested = args.workers
+    max_connections = int(os.getenv("DB_MAX_CONNECTIONS", 10))
+    background_connections = int(os.getenv("DB_BACKGROUND_POOL_SIZE", 1))
+    workers, pool_size = split_pool_budget(requested, max_connections, background_connections)
+    if workers < requested:
+        print(f"⚠️ Only {max_connections} database connections available, running {workers} of {requested} workers")
+
+    # Worker processes inherit the environment, so each one builds its own pool of this size
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = "0"
+    os.environ["DB_POOL_WARMUP"] = str(min(int(os.getenv("DB_POOL_WARMUP", pool_size)), pool_size))
+
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    print(
+        f"🚀 Starting {workers} worker(s) on {args.host}:{args.port} "
+        f"({loop}/{http}, {pool_size} request + {background_connections} background connection(s) each, "
+        f"{workers * (pool_size + background_connections)} total)"
+    )
+
+    uvicorn.run(
+        "main:app",
+        host=args.host,
+        port=args.port,
+        workers=workers,
+        loop=loop,
+        http=http,
+        access_log=args.access_log,
+        backlog=int(os.getenv("SERVER_BACKLOG", 2048)),
+        timeout_keep_alive=int(os.getenv("KEEP_ALIVE_TIMEOUT", 5)),
+        timeout_graceful_shutdown=int(os.getenv("GRACEFUL_SHUTDOWN_TIMEOUT", 30)),
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
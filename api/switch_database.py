@@ -1,23 +1,27 @@
 #!/usr/bin/env python3
 """
 Database switching utility for MZUI Data Marketplace
-Usage: python switch_database.py [local|supabase|supabase2]
+Usage: python switch_database.py [local|supabase|supabase2|current]
+       python switch_database.py bench [--samples N] [--switch]
 """
 
 import sys
 import os
+import math
 import shutil
+import statistics
+import time
+
+# Define available configurations
+configs = {
+    'local': '.env.local',
+    'supabase': '.env.supabase', 
+    'supabase2': '.env.supabase2'
+}
 
 def switch_database(target):
     """Switch to the specified database configuration"""
     
-    # Define available configurations
-    configs = {
-        'local': '.env.local',
-        'supabase': '.env.supabase', 
-        'supabase2': '.env.supabase2'
-    }
-    
     if target not in configs:
         print(f"❌ Invalid database target: {target}")
         print(f"Available options: {', '.join(configs.keys())}")
@@ -80,6 +84,115 @@ def show_current():
                 print(f"🔗 Host: {host}")
                 break
 
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of timings"""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+def time_calls(func, samples):
+    """Run func `samples` times and return the timings in milliseconds"""
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def bench_target(env_file, samples):
+    """Measure connect time, RTT and route query latency for one .env target"""
+    from dotenv import dotenv_values
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.orm import Session
+    from sqlalchemy.pool import NullPool
+    from database.connection import get_database_url, get_engine_kwargs
+    from routes.datasets import get_datasets, get_dataset_detail
+
+    env = dotenv_values(env_file)
+    database_url = get_database_url(env)
+    engine_kwargs = get_engine_kwargs(database_url, env)
+    connect_args = engine_kwargs.get("connect_args", {})
+
+    pooled = create_engine(database_url, **engine_kwargs)
+    unpooled = create_engine(database_url, poolclass=NullPool, connect_args=connect_args)
+
+    # The undecorated route functions run exactly the route queries, without admission control
+    def list_page(engine):
+        with Session(engine) as db:
+            return get_datasets.__wrapped__(
+                page=1, limit=20, cursor=None, search=None, business_line=None, data_domain=None, user_id=None, db=db
+            )
+
+    def detail(engine, dataset_id):
+        with Session(engine) as db:
+            return get_dataset_detail.__wrapped__(dataset_id, fields=None, include=None, db=db)
+
+    def connect():
+        unpooled.connect().close()
+
+    try:
+        result = {"connect": time_calls(connect, samples)}
+
+        with pooled.connect() as connection:
+            result["rtt"] = time_calls(lambda: connection.execute(text("SELECT 1")).scalar(), samples)
+
+        first_page = list_page(pooled)
+        if not first_page["datasets"]:
+            raise RuntimeError("no datasets found")
+        dataset_id = first_page["datasets"][0]["id"]
+
+        result["list_pooled"] = time_calls(lambda: list_page(pooled), samples)
+        result["list_unpooled"] = time_calls(lambda: list_page(unpooled), samples)
+        result["detail_pooled"] = time_calls(lambda: detail(pooled, dataset_id), samples)
+        result["detail_unpooled"] = time_calls(lambda: detail(unpooled, dataset_id), samples)
+        return result
+    finally:
+        pooled.dispose()
+        unpooled.dispose()
+
+def bench(samples=20, switch=False):
+    """Benchmark every configured .env target and optionally switch to the fastest"""
+    targets = [(name, env_file) for name, env_file in configs.items() if os.path.exists(env_file)]
+    if not targets:
+        print(f"❌ No configuration files found ({', '.join(configs.values())})")
+        return False
+
+    print(f"⏱️  Benchmarking {len(targets)} database target(s), {samples} samples each...")
+    results = {}
+    for name, env_file in targets:
+        print(f"   {name} ({env_file})...")
+        try:
+            results[name] = bench_target(env_file, samples)
+        except Exception as e:
+            print(f"   ❌ {name} failed: {e}")
+
+    if not results:
+        return False
+
+    # All timings in ms, p50 for connect/RTT, p50/p95 for route queries
+    print()
+    print(f"{'target':<12}{'connect':>9}{'rtt':>8}{'list pooled':>16}{'list no pool':>16}{'detail pooled':>16}{'detail no pool':>16}")
+    for name, result in results.items():
+        def p50_p95(key):
+            return f"{percentile(result[key], 50):.1f}/{percentile(result[key], 95):.1f}"
+
+        print(
+            f"{name:<12}{statistics.median(result['connect']):>9.1f}{statistics.median(result['rtt']):>8.1f}"
+            f"{p50_p95('list_pooled'):>16}{p50_p95('list_unpooled'):>16}"
+            f"{p50_p95('detail_pooled'):>16}{p50_p95('detail_unpooled'):>16}"
+        )
+    print("(milliseconds; connect/rtt are p50, route columns are p50/p95)")
+
+    # Fastest = lowest typical pooled request latency, as the API server sees it
+    fastest = min(
+        results,
+        key=lambda name: percentile(results[name]["list_pooled"], 50) + percentile(results[name]["detail_pooled"], 50),
+    )
+    print(f"\n🏆 Fastest target: {fastest}")
+
+    if switch:
+        return switch_database(fastest)
+    return True
+
 def main():
     print("🔄 MZUI Data Marketplace - Database Switcher")
     print("=" * 45)
@@ -91,12 +204,20 @@ def main():
         print("  python switch_database.py supabase   # Switch to original Supabase")
         print("  python switch_database.py supabase2  # Switch to Supabase2 (faster)")
         print("  python switch_database.py current    # Show current configuration")
+        print("  python switch_database.py bench      # Measure latency of every target")
+        print("  python switch_database.py bench --switch  # ...and switch to the fastest")
         return
     
     command = sys.argv[1].lower()
     
     if command == 'current':
         show_current()
+    elif command == 'bench':
+        samples = 20
+        if '--samples' in sys.argv:
+            samples = int(sys.argv[sys.argv.index('--samples') + 1])
+        if not bench(samples=samples, switch='--switch' in sys.argv):
+            sys.exit(1)
     else:
         success = switch_database(command)
         if not success:
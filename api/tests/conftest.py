@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import the api modules the same way the app does, from the api directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,86 @@
+"""
+Query counts for GET /api/datasets/{id} per ?fields= / ?include= combination.
+Every request runs one set_config (statement timeout), one base query with metrics
+joined in, and exactly one sub-query per selected include.
+"""
+
+from itertools import combinations
+
+import pytest
+
+from routes.datasets import DETAIL_INCLUDES, get_dataset_detail
+
+
+class StubRow:
+    """A dataset row whose every column is NULL"""
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [None] * 16
+        return None
+
+
+class StubResult:
+    def __init__(self, row=None):
+        self._row = row
+
+    def __iter__(self):
+        return iter([])
+
+    def fetchone(self):
+        return self._row
+
+
+class CountingSession:
+    """Stands in for the SQLAlchemy session and records every statement executed"""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        # Only the base query needs a row, so the dataset is found
+        return StubResult(StubRow() if "WHERE d.id = :dataset_id" in sql else None)
+
+
+def run_detail(fields=None, include=None):
+    db = CountingSession()
+    dataset = get_dataset_detail("DS0001", fields=fields, include=include, db=db)
+    return db.statements, dataset
+
+
+def statement_count(fields=None, include=None):
+    statements, _ = run_detail(fields, include)
+    assert "set_config('statement_timeout'" in statements[0]
+    return len(statements)
+
+
+INCLUDE_COMBINATIONS = [
+    list(combo) for size in range(1, len(DETAIL_INCLUDES) + 1) for combo in combinations(DETAIL_INCLUDES, size)
+]
+
+
+def test_no_parameters_runs_base_query_and_every_include():
+    assert statement_count() == 1 + 1 + len(DETAIL_INCLUDES)
+
+
+def test_fields_only_runs_no_includes():
+    assert statement_count(fields="name,metrics") == 1 + 1
+
+
+def test_fields_without_metrics_skips_the_metrics_join():
+    statements, dataset = run_detail(fields="name")
+    assert len(statements) == 1 + 1
+    assert "dataset_metrics" not in statements[1]
+    assert "metrics" not in dataset
+
+
+@pytest.mark.parametrize("includes", INCLUDE_COMBINATIONS, ids=lambda combo: "+".join(combo))
+def test_each_include_adds_one_query(includes):
+    assert statement_count(include=",".join(includes)) == 1 + 1 + len(includes)
+
+
+@pytest.mark.parametrize("includes", INCLUDE_COMBINATIONS, ids=lambda combo: "+".join(combo))
+def test_each_include_adds_one_query_with_fields(includes):
+    assert statement_count(fields="name,metrics", include=",".join(includes)) == 1 + 1 + len(includes)
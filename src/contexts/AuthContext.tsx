@@ -1,4 +1,5 @@
 import { createContext, useContext, useState, useEffect, ReactNode } from "react"
+import { userService } from "@/services/userService"
 
 interface User {
   username: string
@@ -48,6 +49,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
         const parsedUser = JSON.parse(userData)
         setIsAuthenticated(true)
         setUser(parsedUser)
+        userService.setCurrentUser(parsedUser.username)
         console.log("AuthContext: User is authenticated", parsedUser)
       } catch (error) {
         console.error("AuthContext: Error parsing user data", error)
@@ -66,6 +68,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
     console.log("AuthContext: Logging in user", userData)
     setIsAuthenticated(true)
     setUser(userData)
+    userService.setCurrentUser(userData.username)
     localStorage.setItem("isAuthenticated", "true")
     localStorage.setItem("user", JSON.stringify(userData))
   }
@@ -74,6 +77,7 @@ export function AuthProvider({ children }: { children: ReactNode }) {
     console.log("AuthContext: Logging out user")
     setIsAuthenticated(false)
     setUser(null)
+    userService.setCurrentUser(null)
     localStorage.removeItem("isAuthenticated")
     localStorage.removeItem("user")
   }
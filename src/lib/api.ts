@@ -49,6 +49,16 @@ class ApiClient {
     delete this.defaultHeaders['Authorization']
   }
 
+  // Set the calling user's id, read by the API when TRUST_USER_ID_HEADER is enabled
+  setUserId(userId: string) {
+    this.defaultHeaders['X-User-Id'] = userId
+  }
+
+  // Remove the calling user's id
+  clearUserId() {
+    delete this.defaultHeaders['X-User-Id']
+  }
+
   // Main request method with error handling and retries
   async request<T>(
     endpoint: string,
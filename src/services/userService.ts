@@ -5,6 +5,15 @@ import { User, UserPreferences, UserProfileFormData, ApiResponse } from "@/types
 export class UserService {
   private readonly basePath = '/users'
 
+  // Identify the signed-in user on every API request (favorites are keyed by this id)
+  setCurrentUser(userId: string | null) {
+    if (userId) {
+      apiClient.setUserId(userId)
+    } else {
+      apiClient.clearUserId()
+    }
+  }
+
   // Get current user profile
   async getCurrentUser(): Promise<User> {
     const response = await apiClient.get<ApiResponse<User>>(`${this.basePath}/me`)